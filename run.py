@@ -1,7 +1,11 @@
 import argparse
+import os
 import sys
+from pathlib import Path
 
 from tm.machine import Machine
+from tm.macro import save_macros
+from tm.portfolio import run_portfolio
 from tools.normalize import expand
 
 
@@ -33,6 +37,28 @@ def parse_args() -> argparse.Namespace:
         default = 8_000,
     )
 
+    parser.add_argument(
+        "-f", "--portfolio",
+        action = "store_true",
+    )
+
+    parser.add_argument(
+        "-k", "--backoff",
+        action = "store_true",
+    )
+
+    parser.add_argument(
+        "-c", "--cache",
+        type = Path,
+        default = None,
+    )
+
+    parser.add_argument(
+        "-l", "--cache-limit",
+        type = int,
+        default = os.environ.get('MACRO_CACHE_LIMIT'),
+    )
+
     return parser.parse_args()
 
 
@@ -42,13 +68,28 @@ if __name__ == '__main__':
     args = parse_args()
 
     for i, prog in enumerate(map(expand, sys.stdin)):
+        if args.portfolio:
+            outcome = run_portfolio(
+                prog,
+                sim_lim = args.steps,
+                opt_macro = args.macro,
+            )
+
+            print(f"{i} | {outcome}")
+            continue
+
         machine = Machine(
             prog,
             opt_macro = args.macro,
             backsym = args.backsym,
+            cache_dir = args.cache,
+            cache_limit = args.cache_limit,
         ).run(
             sim_lim = args.steps,
             watch_tape = args.print,
+            backoff = args.backoff,
         )
 
+        save_macros(machine.program)
+
         print(f"{i} | {machine}")
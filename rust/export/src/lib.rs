@@ -1,9 +1,10 @@
 #![expect(clippy::shadow_unrelated, non_camel_case_types)]
 
-use pyo3::{pyclass, pyfunction, pymethods, pymodule};
+use pyo3::{Python, pyclass, pyfunction, pymethods, pymodule};
+use rayon::prelude::*;
 
 use tm::{
-    Instr, Prog as ProgGen, Slot, State, Steps,
+    Instr, Prog as ProgGen, Shift, Slot, State, Steps,
     bkw::{BackwardResult as BackwardResultRs, BackwardResult::*},
     instrs::{self, Parse as _},
 };
@@ -13,23 +14,21 @@ type Prog = ProgGen<10, 10>;
 /***************************************/
 
 #[pyfunction]
-pub fn opt_block(prog: &str, steps: Steps) -> usize {
-    Prog::from(prog).opt_block(steps)
-}
+pub fn opt_block(py: Python<'_>, prog: &str, steps: Steps) -> usize {
+    let prog = Prog::from(prog);
 
-#[pyfunction]
-pub fn term_or_rec(prog: &str, sim_lim: Steps) -> bool {
-    Prog::from(prog).term_or_rec_fresh(sim_lim).is_settled()
+    py.detach(|| prog.opt_block(steps))
 }
 
 #[pyfunction]
-pub fn run_transcript(prog: &str, sim_lim: Steps) -> bool {
-    Prog::from(prog).run_transcript_fresh(sim_lim).is_settled()
-}
+pub fn rank_blocks(
+    py: Python<'_>,
+    prog: &str,
+    steps: Steps,
+) -> Vec<(usize, usize)> {
+    let prog = Prog::from(prog);
 
-#[pyfunction]
-pub fn check_inf(prog: &str, sim_lim: Steps) -> bool {
-    Prog::from(prog).check_inf(sim_lim)
+    py.detach(|| prog.rank_blocks(steps))
 }
 
 #[pyfunction]
@@ -60,14 +59,11 @@ pub fn show_comp(comp: Instrs) -> String {
 
 #[pyfunction]
 pub fn tcompile(prog: &str) -> Instrs {
-    let p = Prog::from(prog);
-    let mut instrs = Instrs::new();
-
-    for (slot, instr) in p.iter() {
-        instrs.insert(slot, *instr);
-    }
+    compile(&Prog::from(prog))
+}
 
-    instrs
+fn compile(prog: &Prog) -> Instrs {
+    prog.iter().map(|(slot, instr)| (slot, *instr)).collect()
 }
 
 #[pyfunction]
@@ -87,6 +83,66 @@ pub fn read_instr(instr: &str) -> Option<Instr> {
 
 /***************************************/
 
+use std::collections::BTreeSet as Set;
+
+#[pyclass(name = "Prog", frozen, eq, hash)]
+#[derive(PartialEq, Eq, Hash)]
+pub struct ProgPy(Prog);
+
+#[pymethods]
+impl ProgPy {
+    #[new]
+    fn new(prog: &str) -> Self {
+        Self(Prog::from(prog))
+    }
+
+    fn __str__(&self) -> String {
+        self.0.to_string()
+    }
+
+    fn __repr__(&self) -> String {
+        format!("Prog(\"{}\")", self.0)
+    }
+
+    fn tcompile(&self) -> Instrs {
+        compile(&self.0)
+    }
+
+    fn halt_slots(&self) -> Set<Slot> {
+        self.0.halt_slots().into_iter().collect()
+    }
+
+    fn erase_slots(&self) -> Set<Slot> {
+        self.0.erase_slots().into_iter().collect()
+    }
+
+    fn zr_shifts(&self) -> Set<(State, Shift)> {
+        self.0.zr_shifts().into_iter().collect()
+    }
+
+    fn opt_block(&self, py: Python<'_>, steps: Steps) -> usize {
+        py.detach(|| self.0.opt_block(steps))
+    }
+
+    fn rank_blocks(
+        &self,
+        py: Python<'_>,
+        steps: Steps,
+    ) -> Vec<(usize, usize)> {
+        py.detach(|| self.0.rank_blocks(steps))
+    }
+
+    fn run_quick_machine(
+        &self,
+        py: Python<'_>,
+        sim_lim: Steps,
+    ) -> MachineResult {
+        py.detach(|| quick_machine(&self.0, sim_lim))
+    }
+}
+
+/***************************************/
+
 #[pyclass]
 pub enum BackwardResult {
     refuted { step: Steps },
@@ -128,106 +184,415 @@ impl From<BackwardResultRs> for BackwardResult {
     }
 }
 
-#[pyfunction]
-pub fn bkw_cant_halt(prog: &str, steps: Steps) -> BackwardResult {
-    Prog::from(prog).bkw_cant_halt(steps).into()
+/***************************************/
+
+use core::{
+    sync::atomic::{AtomicBool, Ordering::Relaxed},
+    time::Duration,
+};
+use std::{sync::Arc, time::Instant};
+
+use pyo3::{PyRef, PyResult, exceptions::PyValueError};
+use tm::budget::{Budget, Outcome as OutcomeRs, Report as ReportRs};
+
+#[pyclass(frozen)]
+pub struct CancelToken(Arc<AtomicBool>);
+
+#[pymethods]
+impl CancelToken {
+    #[new]
+    fn new() -> Self {
+        Self(Arc::new(AtomicBool::new(false)))
+    }
+
+    fn cancel(&self) {
+        self.0.store(true, Relaxed);
+    }
+
+    fn is_cancelled(&self) -> bool {
+        self.0.load(Relaxed)
+    }
 }
 
-#[pyfunction]
-pub fn bkw_cant_blank(prog: &str, steps: Steps) -> BackwardResult {
-    Prog::from(prog).bkw_cant_blank(steps).into()
+#[pyclass(name = "Budget", frozen)]
+pub struct BudgetPy {
+    work: Option<u64>,
+    timeout: Option<Duration>,
+    cancel: Option<Arc<AtomicBool>>,
 }
 
-#[pyfunction]
-pub fn bkw_cant_zloop(prog: &str, steps: Steps) -> BackwardResult {
-    Prog::from(prog).bkw_cant_zloop(steps).into()
+#[pymethods]
+impl BudgetPy {
+    #[new]
+    #[pyo3(signature = (work = None, timeout = None, cancel = None))]
+    fn new(
+        work: Option<u64>,
+        timeout: Option<f64>,
+        cancel: Option<PyRef<'_, CancelToken>>,
+    ) -> PyResult<Self> {
+        let timeout = timeout
+            .map(|secs| {
+                Duration::try_from_secs_f64(secs).map_err(|_| {
+                    PyValueError::new_err(format!(
+                        "invalid timeout: {secs}"
+                    ))
+                })
+            })
+            .transpose()?;
+
+        Ok(Self {
+            work,
+            timeout,
+            cancel: cancel.map(|cancel| Arc::clone(&cancel.0)),
+        })
+    }
 }
 
-#[pyfunction]
-pub fn bkw_cant_spinout(prog: &str, steps: Steps) -> BackwardResult {
-    Prog::from(prog).bkw_cant_spinout(steps).into()
+impl BudgetPy {
+    /// The deadline is set when each program starts, so a batch
+    /// gives every program the same allowance.
+    fn run(&self, decider: impl FnOnce() -> bool) -> Report {
+        Budget {
+            work: self.work,
+            deadline: self.timeout.and_then(|timeout| {
+                Instant::now().checked_add(timeout)
+            }),
+            cancel: self.cancel.as_ref().map(Arc::clone),
+        }
+        .run(decider)
+        .into()
+    }
 }
 
-#[pyfunction]
-pub fn bkw_cant_twostep(prog: &str, steps: Steps) -> BackwardResult {
-    Prog::from(prog).bkw_cant_twostep(steps).into()
+#[pyclass(eq, eq_int, from_py_object)]
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub enum Outcome {
+    proved,
+    unproved,
+    exhausted,
 }
 
-/***************************************/
+#[pyclass(frozen, get_all)]
+pub struct Report {
+    outcome: Outcome,
+    work: u64,
+}
 
-use tm::cps::Radius;
+#[pymethods]
+impl Report {
+    const fn is_settled(&self) -> bool {
+        matches!(self.outcome, Outcome::proved)
+    }
 
-#[pyfunction]
-pub fn cps_cant_halt(prog: &str, rad: Radius) -> bool {
-    let p = Prog::from(prog);
+    const fn is_exhausted(&self) -> bool {
+        matches!(self.outcome, Outcome::exhausted)
+    }
+
+    fn __str__(&self) -> String {
+        let outcome = match self.outcome {
+            Outcome::proved => "proved",
+            Outcome::unproved => "unproved",
+            Outcome::exhausted => "exhausted",
+        };
 
-    if p.halt_slots().is_empty() {
-        return true;
+        format!("{outcome}({})", self.work)
     }
+}
 
-    p.cps_cant_halt(rad)
+impl From<ReportRs> for Report {
+    fn from(report: ReportRs) -> Self {
+        Self {
+            outcome: match report.outcome {
+                OutcomeRs::Proved => Outcome::proved,
+                OutcomeRs::Unproved => Outcome::unproved,
+                OutcomeRs::Exhausted => Outcome::exhausted,
+            },
+            work: report.work,
+        }
+    }
 }
 
-#[pyfunction]
-pub fn cps_cant_blank(prog: &str, rad: Radius) -> bool {
-    let p = Prog::from(prog);
+trait Settles {
+    fn settles(&self) -> bool;
+}
 
-    if p.erase_slots().is_empty() {
-        return true;
+impl Settles for bool {
+    fn settles(&self) -> bool {
+        *self
     }
+}
 
-    p.cps_cant_blank(rad)
+impl Settles for BackwardResult {
+    fn settles(&self) -> bool {
+        self.is_refuted()
+    }
 }
 
-#[pyfunction]
-pub fn cps_cant_spinout(prog: &str, rad: Radius) -> bool {
-    let p = Prog::from(prog);
+macro_rules! detached {
+    (
+        trait $run:ident;
+
+        $(
+            fn $single:ident, $batch:ident
+                $(; $budget:ident, $budget_batch:ident)?
+                ($prog:ident, $param:ident: $typ:ty) -> $res:ty $body:block
+        )*
+    ) => {
+        trait $run {
+            $(
+                fn $single(&self, $param: $typ) -> $res;
+            )*
+        }
 
-    if p.zr_shifts().is_empty() {
-        return true;
-    }
+        impl $run for Prog {
+            $(
+                fn $single(&self, $param: $typ) -> $res {
+                    let $prog = self;
 
-    p.cps_cant_spinout(rad)
+                    $body
+                }
+            )*
+        }
+
+        $(
+            #[pyfunction]
+            pub fn $single(
+                py: Python<'_>,
+                prog: &str,
+                $param: $typ,
+            ) -> $res {
+                let prog = Prog::from(prog);
+
+                py.detach(|| $run::$single(&prog, $param))
+            }
+
+            #[expect(clippy::needless_pass_by_value)]
+            #[pyfunction]
+            pub fn $batch(
+                py: Python<'_>,
+                progs: Vec<String>,
+                $param: $typ,
+            ) -> Vec<$res> {
+                py.detach(|| {
+                    progs
+                        .par_iter()
+                        .map(|prog| {
+                            $run::$single(
+                                &Prog::from(prog.as_str()),
+                                $param,
+                            )
+                        })
+                        .collect()
+                })
+            }
+
+            $(
+                #[pyfunction]
+                pub fn $budget(
+                    py: Python<'_>,
+                    prog: &str,
+                    $param: $typ,
+                    budget: &BudgetPy,
+                ) -> Report {
+                    let prog = Prog::from(prog);
+
+                    py.detach(|| {
+                        budget.run(|| {
+                            $run::$single(&prog, $param).settles()
+                        })
+                    })
+                }
+
+                #[expect(clippy::needless_pass_by_value)]
+                #[pyfunction]
+                pub fn $budget_batch(
+                    py: Python<'_>,
+                    progs: Vec<String>,
+                    $param: $typ,
+                    budget: &BudgetPy,
+                ) -> Vec<Report> {
+                    py.detach(|| {
+                        progs
+                            .par_iter()
+                            .map(|prog| {
+                                let prog = Prog::from(prog.as_str());
+
+                                budget.run(|| {
+                                    $run::$single(&prog, $param)
+                                        .settles()
+                                })
+                            })
+                            .collect()
+                    })
+                }
+            )?
+        )*
+
+        #[pymethods]
+        impl ProgPy {
+            $(
+                fn $single(
+                    &self,
+                    py: Python<'_>,
+                    $param: $typ,
+                ) -> $res {
+                    py.detach(|| $run::$single(&self.0, $param))
+                }
+            )*
+        }
+    };
 }
 
-#[pyfunction]
-pub fn cps_cant_quasihalt(prog: &str, rad: Radius) -> bool {
-    Prog::from(prog).cps_cant_quasihalt(rad)
+/***************************************/
+
+detached! {
+    trait Sim;
+
+    fn term_or_rec, term_or_rec_batch
+        (p, sim_lim: Steps) -> bool
+    {
+        p.term_or_rec_fresh(sim_lim).is_settled()
+    }
+
+    fn run_transcript, run_transcript_batch
+        (p, sim_lim: Steps) -> bool
+    {
+        p.run_transcript_fresh(sim_lim).is_settled()
+    }
+
+    fn check_inf, check_inf_batch
+        (p, sim_lim: Steps) -> bool
+    {
+        p.check_inf(sim_lim)
+    }
 }
 
 /***************************************/
 
-#[pyfunction]
-pub fn far_cant_halt(prog: &str, steps: Steps) -> bool {
-    let p = Prog::from(prog);
+detached! {
+    trait Bkw;
+
+    fn bkw_cant_halt, bkw_cant_halt_batch;
+        bkw_cant_halt_budget, bkw_cant_halt_budget_batch
+        (p, steps: Steps) -> BackwardResult
+    {
+        p.bkw_cant_halt(steps).into()
+    }
+
+    fn bkw_cant_blank, bkw_cant_blank_batch;
+        bkw_cant_blank_budget, bkw_cant_blank_budget_batch
+        (p, steps: Steps) -> BackwardResult
+    {
+        p.bkw_cant_blank(steps).into()
+    }
 
-    if p.halt_slots().is_empty() {
-        return true;
+    fn bkw_cant_zloop, bkw_cant_zloop_batch;
+        bkw_cant_zloop_budget, bkw_cant_zloop_budget_batch
+        (p, steps: Steps) -> BackwardResult
+    {
+        p.bkw_cant_zloop(steps).into()
     }
 
-    p.far_cant_halt(steps)
+    fn bkw_cant_spinout, bkw_cant_spinout_batch;
+        bkw_cant_spinout_budget, bkw_cant_spinout_budget_batch
+        (p, steps: Steps) -> BackwardResult
+    {
+        p.bkw_cant_spinout(steps).into()
+    }
+
+    fn bkw_cant_twostep, bkw_cant_twostep_batch;
+        bkw_cant_twostep_budget, bkw_cant_twostep_budget_batch
+        (p, steps: Steps) -> BackwardResult
+    {
+        p.bkw_cant_twostep(steps).into()
+    }
 }
 
-#[pyfunction]
-pub fn far_cant_blank(prog: &str, steps: Steps) -> bool {
-    let p = Prog::from(prog);
+/***************************************/
+
+use tm::cps::Radius;
+
+detached! {
+    trait Cps;
+
+    fn cps_cant_halt, cps_cant_halt_batch;
+        cps_cant_halt_budget, cps_cant_halt_budget_batch
+        (p, rad: Radius) -> bool
+    {
+        if p.halt_slots().is_empty() {
+            return true;
+        }
+
+        p.cps_cant_halt(rad)
+    }
+
+    fn cps_cant_blank, cps_cant_blank_batch;
+        cps_cant_blank_budget, cps_cant_blank_budget_batch
+        (p, rad: Radius) -> bool
+    {
+        if p.erase_slots().is_empty() {
+            return true;
+        }
+
+        p.cps_cant_blank(rad)
+    }
+
+    fn cps_cant_spinout, cps_cant_spinout_batch;
+        cps_cant_spinout_budget, cps_cant_spinout_budget_batch
+        (p, rad: Radius) -> bool
+    {
+        if p.zr_shifts().is_empty() {
+            return true;
+        }
 
-    if p.erase_slots().is_empty() {
-        return true;
+        p.cps_cant_spinout(rad)
     }
 
-    p.far_cant_blank(steps)
+    fn cps_cant_quasihalt, cps_cant_quasihalt_batch;
+        cps_cant_quasihalt_budget, cps_cant_quasihalt_budget_batch
+        (p, rad: Radius) -> bool
+    {
+        p.cps_cant_quasihalt(rad)
+    }
 }
 
-#[pyfunction]
-pub fn far_cant_spinout(prog: &str, steps: Steps) -> bool {
-    let p = Prog::from(prog);
+/***************************************/
+
+detached! {
+    trait Far;
+
+    fn far_cant_halt, far_cant_halt_batch;
+        far_cant_halt_budget, far_cant_halt_budget_batch
+        (p, steps: Steps) -> bool
+    {
+        if p.halt_slots().is_empty() {
+            return true;
+        }
+
+        p.far_cant_halt(steps)
+    }
+
+    fn far_cant_blank, far_cant_blank_batch;
+        far_cant_blank_budget, far_cant_blank_budget_batch
+        (p, steps: Steps) -> bool
+    {
+        if p.erase_slots().is_empty() {
+            return true;
+        }
 
-    if p.zr_shifts().is_empty() {
-        return true;
+        p.far_cant_blank(steps)
     }
 
-    p.far_cant_spinout(steps)
+    fn far_cant_spinout, far_cant_spinout_batch;
+        far_cant_spinout_budget, far_cant_spinout_budget_batch
+        (p, steps: Steps) -> bool
+    {
+        if p.zr_shifts().is_empty() {
+            return true;
+        }
+
+        p.far_cant_spinout(steps)
+    }
 }
 
 /***************************************/
@@ -339,9 +704,17 @@ impl MachineResult {
 }
 
 #[pyfunction]
-pub fn run_quick_machine(prog: &str, sim_lim: Steps) -> MachineResult {
+pub fn run_quick_machine(
+    py: Python<'_>,
+    prog: &str,
+    sim_lim: Steps,
+) -> MachineResult {
     let prog = Prog::from(prog);
 
+    py.detach(|| quick_machine(&prog, sim_lim))
+}
+
+fn quick_machine(prog: &Prog, sim_lim: Steps) -> MachineResult {
     let mut config = AlgConfig::init();
 
     let mut blanks = Blanks::new();
@@ -431,16 +804,387 @@ impl PastConfigPy {
 
 /**************************************/
 
+use tm::{
+    Goal,
+    pipeline::{Pipeline, Stage},
+};
+
+fn read_goal(goal: &str) -> PyResult<Goal> {
+    match goal {
+        "halt" => Ok(Goal::Halt),
+        "blank" => Ok(Goal::Blank),
+        "spinout" => Ok(Goal::Spinout),
+        _ => {
+            Err(PyValueError::new_err(format!("unknown goal: {goal}")))
+        },
+    }
+}
+
+#[pyclass(frozen, get_all)]
+pub struct Verdict {
+    stage: Option<String>,
+    timings: Vec<(String, f64)>,
+}
+
+#[pymethods]
+impl Verdict {
+    const fn is_settled(&self) -> bool {
+        self.stage.is_some()
+    }
+
+    fn __str__(&self) -> String {
+        self.stage.as_deref().unwrap_or("holdout").into()
+    }
+}
+
+#[pyclass(name = "Pipeline", frozen)]
+pub struct PipelinePy(Pipeline);
+
+#[pymethods]
+impl PipelinePy {
+    #[new]
+    #[pyo3(signature = (goal, stages = None))]
+    fn new(
+        goal: &str,
+        stages: Option<Vec<(String, usize)>>,
+    ) -> PyResult<Self> {
+        let goal = read_goal(goal)?;
+
+        let Some(stages) = stages else {
+            return Ok(Self(Pipeline::standard(goal)));
+        };
+
+        let stages = stages
+            .iter()
+            .map(|(name, budget)| {
+                Stage::read(name, *budget).ok_or_else(|| {
+                    PyValueError::new_err(format!(
+                        "unknown stage: {name}"
+                    ))
+                })
+            })
+            .collect::<PyResult<_>>()?;
+
+        Ok(Self(Pipeline::new(goal, stages)))
+    }
+
+    fn stages(&self) -> Vec<String> {
+        self.0.stages.iter().map(ToString::to_string).collect()
+    }
+
+    fn __call__(&self, py: Python<'_>, prog: &str) -> Verdict {
+        let prog = Prog::from(prog);
+
+        py.detach(|| self.verdict(&prog))
+    }
+
+    fn run(&self, py: Python<'_>, prog: &ProgPy) -> Verdict {
+        py.detach(|| self.verdict(&prog.0))
+    }
+}
+
+impl PipelinePy {
+    fn verdict(&self, prog: &Prog) -> Verdict {
+        let verdict = self.0.run(prog);
+
+        let stages = &self.0.stages;
+
+        Verdict {
+            stage: verdict
+                .settled
+                .map(|stage| stages[stage].to_string()),
+            timings: stages
+                .iter()
+                .zip(verdict.elapsed)
+                .map(|(stage, elapsed)| {
+                    (stage.to_string(), elapsed.as_secs_f64())
+                })
+                .collect(),
+        }
+    }
+}
+
+/**************************************/
+
+use tm::{cps::CpsCert, far::FarCert};
+
+/// Certificate for a goal that no instruction can reach, matching
+/// the shortcut taken by the `*_cant_*` exports.
+const NO_SLOTS: &str = "slots";
+
+fn no_slots(prog: &Prog, goal: Goal) -> bool {
+    match goal {
+        Goal::Halt => prog.halt_slots().is_empty(),
+        Goal::Blank => prog.erase_slots().is_empty(),
+        Goal::Spinout => prog.zr_shifts().is_empty(),
+    }
+}
+
+/// `None` stands for the `NO_SLOTS` certificate.
+fn read_cert<Cert>(
+    cert: &str,
+    read: fn(&str) -> Option<Cert>,
+) -> PyResult<Option<Cert>> {
+    if cert == NO_SLOTS {
+        return Ok(None);
+    }
+
+    read(cert).map(Some).ok_or_else(|| {
+        PyValueError::new_err(format!("malformed certificate: {cert}"))
+    })
+}
+
+#[pyfunction]
+pub fn cps_certify(
+    py: Python<'_>,
+    prog: &str,
+    goal: &str,
+    rad: Radius,
+) -> PyResult<Option<String>> {
+    let goal = read_goal(goal)?;
+    let prog = Prog::from(prog);
+
+    Ok(py.detach(|| {
+        if no_slots(&prog, goal) {
+            return Some(NO_SLOTS.to_owned());
+        }
+
+        prog.cps_certify(rad, goal)
+            .as_ref()
+            .map(ToString::to_string)
+    }))
+}
+
+#[pyfunction]
+pub fn cps_verify(
+    py: Python<'_>,
+    prog: &str,
+    goal: &str,
+    cert: &str,
+) -> PyResult<bool> {
+    let goal = read_goal(goal)?;
+    let cert = read_cert(cert, CpsCert::read)?;
+    let prog = Prog::from(prog);
+
+    Ok(py.detach(|| {
+        cert.as_ref().map_or_else(
+            || no_slots(&prog, goal),
+            |cert| prog.cps_verify(goal, cert),
+        )
+    }))
+}
+
+#[pyfunction]
+pub fn cps_verify_batch(
+    py: Python<'_>,
+    certs: Vec<(String, String)>,
+    goal: &str,
+) -> PyResult<Vec<bool>> {
+    let goal = read_goal(goal)?;
+
+    let certs = certs
+        .into_iter()
+        .map(|(prog, cert)| {
+            Ok((
+                Prog::from(prog.as_str()),
+                read_cert(&cert, CpsCert::read)?,
+            ))
+        })
+        .collect::<PyResult<Vec<_>>>()?;
+
+    Ok(py.detach(|| {
+        certs
+            .par_iter()
+            .map(|(prog, cert)| {
+                cert.as_ref().map_or_else(
+                    || no_slots(prog, goal),
+                    |cert| prog.cps_verify(goal, cert),
+                )
+            })
+            .collect()
+    }))
+}
+
+#[pyfunction]
+pub fn far_certify(
+    py: Python<'_>,
+    prog: &str,
+    goal: &str,
+    block: usize,
+) -> PyResult<Option<String>> {
+    let goal = read_goal(goal)?;
+    let prog = Prog::from(prog);
+
+    Ok(py.detach(|| {
+        if no_slots(&prog, goal) {
+            return Some(NO_SLOTS.to_owned());
+        }
+
+        prog.far_certify(block, goal)
+            .as_ref()
+            .map(ToString::to_string)
+    }))
+}
+
+#[pyfunction]
+pub fn far_verify(
+    py: Python<'_>,
+    prog: &str,
+    goal: &str,
+    cert: &str,
+) -> PyResult<bool> {
+    let goal = read_goal(goal)?;
+    let cert = read_cert(cert, FarCert::read)?;
+    let prog = Prog::from(prog);
+
+    Ok(py.detach(|| {
+        cert.as_ref().map_or_else(
+            || no_slots(&prog, goal),
+            |cert| prog.far_verify(goal, cert),
+        )
+    }))
+}
+
+#[pyfunction]
+pub fn far_verify_batch(
+    py: Python<'_>,
+    certs: Vec<(String, String)>,
+    goal: &str,
+) -> PyResult<Vec<bool>> {
+    let goal = read_goal(goal)?;
+
+    let certs = certs
+        .into_iter()
+        .map(|(prog, cert)| {
+            Ok((
+                Prog::from(prog.as_str()),
+                read_cert(&cert, FarCert::read)?,
+            ))
+        })
+        .collect::<PyResult<Vec<_>>>()?;
+
+    Ok(py.detach(|| {
+        certs
+            .par_iter()
+            .map(|(prog, cert)| {
+                cert.as_ref().map_or_else(
+                    || no_slots(prog, goal),
+                    |cert| prog.far_verify(goal, cert),
+                )
+            })
+            .collect()
+    }))
+}
+
+/**************************************/
+
+use std::{
+    sync::mpsc::{Receiver, sync_channel},
+    thread,
+};
+
+use run::{
+    stream::{Batch, Filter, Flush, get_stream},
+    tree::SPLIT,
+};
+
+const BOUND: usize = 16;
+
+#[pyclass]
+pub struct TreeIter {
+    receiver: Receiver<Flush>,
+}
+
+#[pymethods]
+impl TreeIter {
+    #[new]
+    #[pyo3(signature = (
+        states,
+        colors,
+        goal = None,
+        sim_lim = 100,
+        lin = None,
+        pipeline = None,
+        batch = 1_000,
+    ))]
+    fn new(
+        states: usize,
+        colors: usize,
+        goal: Option<&str>,
+        sim_lim: Steps,
+        lin: Option<Steps>,
+        pipeline: Option<PyRef<'_, PipelinePy>>,
+        batch: usize,
+    ) -> PyResult<Self> {
+        let goal = goal.map(read_goal).transpose()?;
+
+        let Some(stream) = get_stream(states, colors) else {
+            return Err(PyValueError::new_err(format!(
+                "unsupported tree: ({states}, {colors})"
+            )));
+        };
+
+        let filter = Filter {
+            lin,
+            pipeline: pipeline.map(|pipeline| pipeline.0.clone()),
+            batch: batch.max(1),
+            checkpoint: None,
+            shard: None,
+            split: SPLIT,
+            progress: None,
+        };
+
+        let (sender, receiver) = sync_channel(BOUND);
+
+        thread::spawn(move || stream(goal, sim_lim, &filter, &sender));
+
+        Ok(Self { receiver })
+    }
+
+    const fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&mut self, py: Python<'_>) -> Option<Batch> {
+        py.detach(|| self.receiver.recv().ok().map(|flush| flush.progs))
+    }
+}
+
+/**************************************/
+
 #[pymodule]
 mod rust_stuff {
     #[pymodule_export]
     use crate::{
-        BackwardResult, MachineResult, PastConfigPy, TermRes,
-        bkw_cant_blank, bkw_cant_halt, bkw_cant_spinout,
-        bkw_cant_twostep, bkw_cant_zloop, check_inf, cps_cant_blank,
-        cps_cant_halt, cps_cant_quasihalt, cps_cant_spinout,
-        far_cant_blank, far_cant_halt, far_cant_spinout, opt_block,
-        read_instr, run_quick_machine, run_transcript, show_comp,
-        show_instr, show_slot, show_state, tcompile, term_or_rec,
+        BackwardResult, BudgetPy, CancelToken, MachineResult, Outcome,
+        PastConfigPy, PipelinePy, ProgPy, Report, TermRes, TreeIter,
+        Verdict, bkw_cant_blank, bkw_cant_blank_batch,
+        bkw_cant_blank_budget, bkw_cant_blank_budget_batch,
+        bkw_cant_halt, bkw_cant_halt_batch, bkw_cant_halt_budget,
+        bkw_cant_halt_budget_batch, bkw_cant_spinout,
+        bkw_cant_spinout_batch, bkw_cant_spinout_budget,
+        bkw_cant_spinout_budget_batch, bkw_cant_twostep,
+        bkw_cant_twostep_batch, bkw_cant_twostep_budget,
+        bkw_cant_twostep_budget_batch, bkw_cant_zloop,
+        bkw_cant_zloop_batch, bkw_cant_zloop_budget,
+        bkw_cant_zloop_budget_batch, check_inf, check_inf_batch,
+        cps_cant_blank, cps_cant_blank_batch, cps_cant_blank_budget,
+        cps_cant_blank_budget_batch, cps_cant_halt,
+        cps_cant_halt_batch, cps_cant_halt_budget,
+        cps_cant_halt_budget_batch, cps_cant_quasihalt,
+        cps_cant_quasihalt_batch, cps_cant_quasihalt_budget,
+        cps_cant_quasihalt_budget_batch, cps_cant_spinout,
+        cps_cant_spinout_batch, cps_cant_spinout_budget,
+        cps_cant_spinout_budget_batch, cps_certify, cps_verify,
+        cps_verify_batch, far_cant_blank, far_cant_blank_batch,
+        far_cant_blank_budget, far_cant_blank_budget_batch,
+        far_cant_halt, far_cant_halt_batch, far_cant_halt_budget,
+        far_cant_halt_budget_batch, far_cant_spinout,
+        far_cant_spinout_batch, far_cant_spinout_budget,
+        far_cant_spinout_budget_batch, far_certify, far_verify,
+        far_verify_batch, opt_block, rank_blocks, read_instr,
+        run_quick_machine, run_transcript, run_transcript_batch,
+        show_comp, show_instr, show_slot, show_state, tcompile,
+        term_or_rec, term_or_rec_batch,
     };
 }
@@ -0,0 +1,814 @@
+use core::{str::FromStr, time::Duration};
+use std::{
+    collections::HashSet as Set,
+    fs::{self, File, OpenOptions},
+    io::{
+        self, BufRead as _, BufReader, BufWriter, ErrorKind, Read as _,
+        Write,
+    },
+    net::{TcpListener, TcpStream},
+    sync::{
+        Mutex, MutexGuard,
+        mpsc::{channel, sync_channel},
+    },
+    thread,
+};
+
+use run::{
+    progress::{Progress, report},
+    stream::{
+        Checkpoint, Done, Filter, Flush, Prefixes, Stream, get_stream,
+    },
+    tree::{SPLIT, Shard},
+};
+use tm::{
+    Goal, Steps,
+    pipeline::{Pipeline, Stage},
+};
+
+/**************************************/
+
+const BOUND: usize = 64;
+const BATCH: usize = 1_000;
+const DEPTH: usize = 2;
+const SHARD_DEPTH: usize = 2;
+const POLL: Duration = Duration::from_millis(50);
+const EVERY: u64 = 10;
+
+const USAGE: &str = "\
+usage: run sweep --params STATES,COLORS [--goal halt|blank|spinout]
+                 [--tree-lim STEPS] [--lin STEPS]
+                 [--pipeline STAGE:BUDGET,...] [--threads N]
+                 [--split-depth N] [--split-slots N]
+                 [--out PATH [--checkpoint PATH [--depth N]]]
+                 [--out PATH --connect ADDR]
+                 [--progress PATH|- [--every SECS] [--expect LEAVES]]
+       run coordinate --bind ADDR --shards N [--out PATH]
+
+stages: slots, lin, bkw, prover, cps, far";
+
+struct Sweep {
+    params: (usize, usize),
+    goal: Option<Goal>,
+    tree_lim: Steps,
+    filter: Filter,
+    threads: Option<usize>,
+    out: Option<String>,
+    checkpoint: Option<String>,
+    connect: Option<String>,
+    progress: Option<String>,
+    every: Duration,
+}
+
+fn read_num<T: FromStr>(val: &str) -> Result<T, String> {
+    val.replace('_', "")
+        .parse()
+        .map_err(|_| format!("bad number: {val}"))
+}
+
+fn read_goal(val: &str) -> Result<Goal, String> {
+    match val {
+        "halt" => Ok(Goal::Halt),
+        "blank" => Ok(Goal::Blank),
+        "spinout" => Ok(Goal::Spinout),
+        _ => Err(format!("unknown goal: {val}")),
+    }
+}
+
+fn read_params(val: &str) -> Result<(usize, usize), String> {
+    let Some((states, colors)) = val.split_once(',') else {
+        return Err(format!("bad params: {val}"));
+    };
+
+    Ok((read_num(states)?, read_num(colors)?))
+}
+
+fn read_stages(val: &str) -> Result<Vec<Stage>, String> {
+    val.split(',')
+        .map(|spec| {
+            let (name, budget) =
+                spec.split_once(':').unwrap_or((spec, "0"));
+
+            Stage::read(name, read_num(budget)?)
+                .ok_or_else(|| format!("unknown stage: {name}"))
+        })
+        .collect()
+}
+
+fn read_sweep(args: &[String]) -> Result<Sweep, String> {
+    let mut params = None;
+    let mut goal = None;
+    let mut tree_lim = 100;
+    let mut lin = None;
+    let mut stages = None;
+    let mut threads = None;
+    let mut split = SPLIT;
+    let mut out = None;
+    let mut checkpoint = None;
+    let mut depth = DEPTH;
+    let mut connect = None;
+    let mut progress = None;
+    let mut every = EVERY;
+    let mut expect = None;
+
+    let mut args = args.iter();
+
+    while let Some(flag) = args.next() {
+        let val = args
+            .next()
+            .ok_or_else(|| format!("missing value for {flag}"))?;
+
+        match flag.as_str() {
+            "--params" => params = Some(read_params(val)?),
+            "--goal" => goal = Some(read_goal(val)?),
+            "--tree-lim" => tree_lim = read_num(val)?,
+            "--lin" => lin = Some(read_num(val)?),
+            "--pipeline" => stages = Some(read_stages(val)?),
+            "--threads" => threads = Some(read_num(val)?),
+            "--split-depth" => split.depth = read_num(val)?,
+            "--split-slots" => split.slots = read_num(val)?,
+            "--out" => out = Some(val.clone()),
+            "--checkpoint" => checkpoint = Some(val.clone()),
+            "--depth" => depth = read_num(val)?,
+            "--connect" => connect = Some(val.clone()),
+            "--progress" => progress = Some(val.clone()),
+            "--every" => every = read_num(val)?,
+            "--expect" => expect = Some(read_num(val)?),
+            _ => return Err(format!("unknown flag: {flag}")),
+        }
+    }
+
+    let params = params.ok_or("missing --params")?;
+
+    let pipeline = match (stages, goal) {
+        (None, _) => None,
+        (Some(stages), Some(goal)) => Some(Pipeline::new(goal, stages)),
+        (Some(_), None) => return Err("--pipeline needs --goal".into()),
+    };
+
+    if checkpoint.is_some() && out.is_none() {
+        return Err("--checkpoint needs --out".into());
+    }
+
+    if connect.is_some() && (out.is_none() || checkpoint.is_some()) {
+        return Err("--connect needs --out and no --checkpoint".into());
+    }
+
+    let mut filter = Filter {
+        lin,
+        pipeline,
+        batch: BATCH,
+        checkpoint: checkpoint.as_ref().map(|_| Checkpoint {
+            depth,
+            done: Set::new(),
+        }),
+        shard: None,
+        split,
+        progress: None,
+    };
+
+    if progress.is_some() {
+        filter.progress =
+            Some(Progress::new(filter.deciders(), expect));
+    }
+
+    Ok(Sweep {
+        params,
+        goal,
+        tree_lim,
+        filter,
+        threads,
+        out,
+        checkpoint,
+        connect,
+        progress,
+        every: Duration::from_secs(every),
+    })
+}
+
+/**************************************/
+
+#[derive(Default)]
+struct Resume {
+    done: Set<String>,
+    holdouts: u64,
+    visited: u64,
+    offset: u64,
+}
+
+fn read_resume(log: &str) -> Resume {
+    let mut resume = Resume::default();
+
+    for (done, offset) in log.lines().filter_map(|line| {
+        let (done, offset) = line.rsplit_once('\t')?;
+        Some((Done::read(done)?, offset.parse().ok()?))
+    }) {
+        resume.holdouts += done.holdouts;
+        resume.visited += done.visited;
+        resume.offset = offset;
+        resume.done.insert(done.prefix);
+    }
+
+    resume
+}
+
+fn load_resume(path: &str) -> Result<Resume, String> {
+    match fs::read_to_string(path) {
+        Ok(log) => Ok(read_resume(&log)),
+        Err(err) if err.kind() == ErrorKind::NotFound => {
+            Ok(Resume::default())
+        },
+        Err(err) => Err(format!("{path}: {err}")),
+    }
+}
+
+fn prune_out(path: &str, resume: &Resume) -> Result<(), String> {
+    let fail = |err: io::Error| format!("{path}: {err}");
+
+    let file = match File::open(path) {
+        Ok(file) => file,
+        Err(err) if err.kind() == ErrorKind::NotFound => return Ok(()),
+        Err(err) => return Err(fail(err)),
+    };
+
+    let prefixes = Prefixes::new(&resume.done);
+
+    let temp = format!("{path}.tmp");
+
+    let mut kept = BufWriter::new(File::create(&temp).map_err(fail)?);
+
+    for line in BufReader::new(file.take(resume.offset)).lines() {
+        let line = line.map_err(fail)?;
+
+        if prefixes.covers(&line) {
+            writeln!(kept, "{line}").map_err(fail)?;
+        }
+    }
+
+    kept.flush().map_err(fail)?;
+
+    fs::rename(&temp, path).map_err(fail)
+}
+
+fn open_out(
+    path: &str,
+    resume: Option<&Resume>,
+) -> Result<File, String> {
+    let Some(resume) = resume else {
+        return File::create(path)
+            .map_err(|err| format!("{path}: {err}"));
+    };
+
+    prune_out(path, resume)?;
+
+    OpenOptions::new()
+        .create(true)
+        .append(true)
+        .open(path)
+        .map_err(|err| format!("{path}: {err}"))
+}
+
+/**************************************/
+
+type Log<'l> = (&'l mut BufWriter<File>, &'l str);
+
+fn write_stream(
+    stream: Stream,
+    sweep: &Sweep,
+    out: &mut dyn Write,
+    mut log: Option<Log<'_>>,
+) -> Result<(u64, u64), String> {
+    let (sender, receiver) = sync_channel(BOUND);
+
+    let (stop, stopped) = channel();
+
+    let mut snapshots: Option<Box<dyn Write + Send>> =
+        match sweep.progress.as_deref() {
+            None => None,
+            Some("-") => Some(Box::new(io::stderr())),
+            Some(path) => Some(Box::new(
+                OpenOptions::new()
+                    .create(true)
+                    .append(true)
+                    .open(path)
+                    .map_err(|err| format!("{path}: {err}"))?,
+            )),
+        };
+
+    thread::scope(|scope| {
+        let tree = scope.spawn(move || {
+            stream(sweep.goal, sweep.tree_lim, &sweep.filter, &sender)
+        });
+
+        let reporter =
+            sweep.filter.progress.as_ref().zip(snapshots.as_mut()).map(
+                |(progress, snapshots)| {
+                    scope.spawn(move || {
+                        report(
+                            progress,
+                            snapshots.as_mut(),
+                            sweep.every,
+                            &stopped,
+                        )
+                    })
+                },
+            );
+
+        for Flush { progs, done } in receiver {
+            for prog in progs {
+                writeln!(out, "{prog}")
+                    .map_err(|err| err.to_string())?;
+            }
+
+            out.flush().map_err(|err| err.to_string())?;
+
+            if let (Some(done), Some((log, path))) = (done, &mut log) {
+                let offset = fs::metadata(*path)
+                    .map_err(|err| format!("{path}: {err}"))?
+                    .len();
+
+                writeln!(log, "{done}\t{offset}")
+                    .map_err(|err| err.to_string())?;
+
+                log.flush().map_err(|err| err.to_string())?;
+            }
+        }
+
+        let counts =
+            tree.join().map_err(|_| "tree thread panicked".to_owned());
+
+        drop(stop);
+
+        if let Some(reporter) = reporter {
+            reporter
+                .join()
+                .map_err(|_| "reporter thread panicked")?
+                .map_err(|err| err.to_string())?;
+        }
+
+        counts
+    })
+}
+
+pub fn sweep(args: &[String]) -> Result<(), String> {
+    let mut sweep =
+        read_sweep(args).map_err(|err| format!("{err}\n{USAGE}"))?;
+
+    let (states, colors) = sweep.params;
+
+    let stream = get_stream(states, colors).ok_or_else(|| {
+        format!("unsupported tree: ({states}, {colors})")
+    })?;
+
+    if let Some(threads) = sweep.threads {
+        rayon::ThreadPoolBuilder::new()
+            .num_threads(threads)
+            .build_global()
+            .map_err(|err| err.to_string())?;
+    }
+
+    if let Some(addr) = &sweep.connect {
+        return work(addr, stream, &mut sweep);
+    }
+
+    let resume = match &sweep.checkpoint {
+        Some(path) => load_resume(path)?,
+        None => Resume::default(),
+    };
+
+    if let Some(checkpoint) = &mut sweep.filter.checkpoint {
+        checkpoint.done.clone_from(&resume.done);
+    }
+
+    let mut log = match &sweep.checkpoint {
+        Some(path) => Some(BufWriter::new(
+            OpenOptions::new()
+                .create(true)
+                .append(true)
+                .open(path)
+                .map_err(|err| format!("{path}: {err}"))?,
+        )),
+        None => None,
+    };
+
+    let mut out: Box<dyn Write> = match &sweep.out {
+        Some(path) => Box::new(BufWriter::new(open_out(
+            path,
+            log.as_ref().map(|_| &resume),
+        )?)),
+        None => Box::new(BufWriter::new(io::stdout().lock())),
+    };
+
+    let (holdouts, visited) = write_stream(
+        stream,
+        &sweep,
+        &mut out,
+        log.as_mut().zip(sweep.out.as_deref()),
+    )?;
+
+    let (holdouts, visited) =
+        (holdouts + resume.holdouts, visited + resume.visited);
+
+    eprintln!("holdouts: {holdouts} | visited: {visited}");
+
+    Ok(())
+}
+
+/**************************************/
+
+fn work(
+    addr: &str,
+    stream: Stream,
+    sweep: &mut Sweep,
+) -> Result<(), String> {
+    let conn = TcpStream::connect(addr)
+        .map_err(|err| format!("{addr}: {err}"))?;
+
+    let mut reader = BufReader::new(
+        conn.try_clone().map_err(|err| err.to_string())?,
+    );
+
+    let mut writer = conn;
+
+    let out = sweep.out.clone().ok_or("--connect needs --out")?;
+
+    loop {
+        writeln!(writer, "next").map_err(|err| err.to_string())?;
+
+        let mut line = String::new();
+
+        reader.read_line(&mut line).map_err(|err| err.to_string())?;
+
+        let Some(("shard", assigned)) = line.trim().split_once(' ')
+        else {
+            return Ok(());
+        };
+
+        let Some((index, count)) = assigned.split_once(' ') else {
+            return Err(format!("bad assignment: {assigned}"));
+        };
+
+        let (index, count) = (read_num(index)?, read_num(count)?);
+
+        sweep.filter.shard = Some(Shard {
+            depth: SHARD_DEPTH,
+            index,
+            count,
+        });
+
+        let path = format!("{out}.{index}");
+
+        let mut file = BufWriter::new(
+            File::create(&path)
+                .map_err(|err| format!("{path}: {err}"))?,
+        );
+
+        let (holdouts, visited) =
+            write_stream(stream, sweep, &mut file, None)?;
+
+        writeln!(writer, "result {index} {holdouts} {visited} {path}")
+            .map_err(|err| err.to_string())?;
+    }
+}
+
+/**************************************/
+
+struct Report {
+    holdouts: u64,
+    visited: u64,
+    path: String,
+}
+
+struct Queue {
+    count: u64,
+    pending: Vec<u64>,
+    reports: Vec<Option<Report>>,
+}
+
+impl Queue {
+    fn new(count: u64) -> Self {
+        Self {
+            count,
+            pending: (0..count).rev().collect(),
+            reports: (0..count).map(|_| None).collect(),
+        }
+    }
+
+    fn finished(&self) -> bool {
+        self.reports.iter().all(Option::is_some)
+    }
+}
+
+fn lock(queue: &Mutex<Queue>) -> Result<MutexGuard<'_, Queue>, String> {
+    queue.lock().map_err(|_| "queue lock poisoned".into())
+}
+
+fn read_report(line: &str) -> Option<(usize, Report)> {
+    let mut fields = line.splitn(4, ' ');
+
+    let index = fields.next()?.parse().ok()?;
+    let holdouts = fields.next()?.parse().ok()?;
+    let visited = fields.next()?.parse().ok()?;
+    let path = fields.next()?.to_owned();
+
+    Some((
+        index,
+        Report {
+            holdouts,
+            visited,
+            path,
+        },
+    ))
+}
+
+fn serve(conn: TcpStream, queue: &Mutex<Queue>) -> Result<(), String> {
+    let mut writer = conn.try_clone().map_err(|err| err.to_string())?;
+
+    let mut assigned = None;
+
+    for line in BufReader::new(conn).lines() {
+        let Ok(line) = line else {
+            break;
+        };
+
+        if line == "next" {
+            let (shard, count) = {
+                let mut queue = lock(queue)?;
+                (queue.pending.pop(), queue.count)
+            };
+
+            assigned = shard;
+
+            let reply = match shard {
+                Some(index) => format!("shard {index} {count}"),
+                None => "done".into(),
+            };
+
+            if writeln!(writer, "{reply}").is_err() {
+                break;
+            }
+        } else if let Some(("result", fields)) = line.split_once(' ')
+            && let Some((index, report)) = read_report(fields)
+            && let Some(slot) = lock(queue)?.reports.get_mut(index)
+        {
+            *slot = Some(report);
+            assigned = None;
+        } else {
+            eprintln!("bad message: {line}");
+            break;
+        }
+    }
+
+    if let Some(index) = assigned {
+        lock(queue)?.pending.push(index);
+    }
+
+    Ok(())
+}
+
+fn serve_shards(
+    listener: &TcpListener,
+    count: u64,
+) -> Result<Vec<Report>, String> {
+    listener
+        .set_nonblocking(true)
+        .map_err(|err| err.to_string())?;
+
+    let queue = Mutex::new(Queue::new(count));
+
+    thread::scope(|scope| {
+        loop {
+            match listener.accept() {
+                Ok((conn, _)) => {
+                    conn.set_nonblocking(false)
+                        .map_err(|err| err.to_string())?;
+
+                    let queue = &queue;
+
+                    scope.spawn(move || {
+                        if let Err(err) = serve(conn, queue) {
+                            eprintln!("{err}");
+                        }
+                    });
+                },
+                Err(err) if err.kind() == ErrorKind::WouldBlock => {
+                    if lock(&queue)?.finished() {
+                        break;
+                    }
+
+                    thread::sleep(POLL);
+                },
+                Err(err) => return Err(err.to_string()),
+            }
+        }
+
+        Ok::<(), String>(())
+    })?;
+
+    Ok(queue
+        .into_inner()
+        .map_err(|_| "queue lock poisoned")?
+        .reports
+        .into_iter()
+        .flatten()
+        .collect())
+}
+
+pub fn coordinate(args: &[String]) -> Result<(), String> {
+    let mut bind = None;
+    let mut shards = None;
+    let mut out = None;
+
+    let mut args = args.iter();
+
+    while let Some(flag) = args.next() {
+        let val = args
+            .next()
+            .ok_or_else(|| format!("missing value for {flag}"))?;
+
+        match flag.as_str() {
+            "--bind" => bind = Some(val.clone()),
+            "--shards" => shards = Some(read_num(val)?),
+            "--out" => out = Some(val.clone()),
+            _ => return Err(format!("unknown flag: {flag}\n{USAGE}")),
+        }
+    }
+
+    let (Some(bind), Some(shards)) = (bind, shards) else {
+        return Err(format!("missing --bind or --shards\n{USAGE}"));
+    };
+
+    if shards == 0 {
+        return Err("--shards must be positive".into());
+    }
+
+    let listener = TcpListener::bind(&bind)
+        .map_err(|err| format!("{bind}: {err}"))?;
+
+    let reports = serve_shards(&listener, shards)?;
+
+    let mut merged: Box<dyn Write> = match &out {
+        Some(path) => Box::new(BufWriter::new(
+            File::create(path)
+                .map_err(|err| format!("{path}: {err}"))?,
+        )),
+        None => Box::new(BufWriter::new(io::stdout().lock())),
+    };
+
+    for Report { path, .. } in &reports {
+        let mut shard =
+            File::open(path).map_err(|err| format!("{path}: {err}"))?;
+
+        io::copy(&mut shard, &mut merged)
+            .map_err(|err| format!("{path}: {err}"))?;
+    }
+
+    merged.flush().map_err(|err| err.to_string())?;
+
+    let (holdouts, visited) =
+        reports.iter().fold((0, 0), |(acc1, acc2), report| {
+            (acc1 + report.holdouts, acc2 + report.visited)
+        });
+
+    eprintln!("holdouts: {holdouts} | visited: {visited}");
+
+    Ok(())
+}
+
+/**************************************/
+
+#[test]
+fn test_read_sweep() {
+    let args = [
+        "--params",
+        "4,2",
+        "--goal",
+        "spinout",
+        "--tree-lim",
+        "99",
+        "--pipeline",
+        "slots,lin:10_000,cps:21",
+    ]
+    .map(String::from);
+
+    let sweep = read_sweep(&args).unwrap();
+
+    assert_eq!(sweep.params, (4, 2));
+    assert_eq!(sweep.tree_lim, 99);
+
+    assert_eq!(sweep.filter.split.depth, SPLIT.depth);
+
+    let split = read_sweep(
+        &[
+            "--params",
+            "4,2",
+            "--split-depth",
+            "5",
+            "--split-slots",
+            "2",
+        ]
+        .map(String::from),
+    )
+    .unwrap()
+    .filter
+    .split;
+
+    assert_eq!((split.depth, split.slots), (5, 2));
+
+    assert_eq!(
+        sweep.filter.pipeline.unwrap().stages,
+        [Stage::Slots, Stage::Lin(10_000), Stage::Cps(21)],
+    );
+
+    assert!(read_sweep(&args[2..]).is_err());
+    assert!(read_sweep(&args[..7]).is_err());
+    assert!(
+        read_sweep(&[
+            "--params".into(),
+            "4,2".into(),
+            "--pipeline".into(),
+            "sat:5".into()
+        ])
+        .is_err()
+    );
+
+    assert!(
+        read_sweep(&[
+            "--params".into(),
+            "4,2".into(),
+            "--checkpoint".into(),
+            "sweep.log".into()
+        ])
+        .is_err()
+    );
+}
+
+#[test]
+fn test_read_resume() {
+    let resume = read_resume(
+        "\
+1RB ...  ... ...\t0\t3\t0
+1RB 1LA  ... ...\t2\t5\t36
+1RB 1LA  1LA ...\t1\t",
+    );
+
+    assert_eq!(resume.holdouts, 2);
+    assert_eq!(resume.visited, 8);
+    assert_eq!(resume.offset, 36);
+
+    assert!(resume.done.contains("1RB 1LA  ... ..."));
+    assert!(!resume.done.contains("1RB 1LA  1LA ..."));
+
+    let prefixes = Prefixes::new(&resume.done);
+
+    assert!(prefixes.covers("1RB 1LA  0LA 1RB"));
+    assert!(prefixes.covers("1RB 0RB  ... 1LA"));
+    assert!(!prefixes.covers("0RB 1LA  1LA ..."));
+}
+
+#[test]
+fn test_coordinate() {
+    let args = ["--params", "2,3", "--out"].map(String::from);
+
+    let dir = std::env::temp_dir()
+        .join(format!("sweep-{}", std::process::id()));
+
+    fs::create_dir_all(&dir).unwrap();
+
+    let out = dir.join("holdouts").to_string_lossy().into_owned();
+
+    let sweep = || {
+        read_sweep(&[args.as_slice(), &[out.clone()]].concat()).unwrap()
+    };
+
+    let stream = get_stream(2, 3).unwrap();
+
+    let total = write_stream(stream, &sweep(), &mut io::sink(), None);
+
+    let listener = TcpListener::bind("127.0.0.1:0").unwrap();
+
+    let addr = listener.local_addr().unwrap().to_string();
+
+    let reports = thread::scope(|scope| {
+        for _ in 0..3 {
+            scope.spawn(|| work(&addr, stream, &mut sweep()));
+        }
+
+        let reports = serve_shards(&listener, 5).unwrap();
+
+        drop(listener);
+
+        reports
+    });
+
+    assert_eq!(reports.len(), 5);
+
+    assert_eq!(
+        total,
+        Ok(reports.iter().fold((0, 0), |(acc1, acc2), report| {
+            (acc1 + report.holdouts, acc2 + report.visited)
+        })),
+    );
+
+    fs::remove_dir_all(&dir).unwrap();
+}
@@ -24,7 +24,7 @@ impl<const s: usize, const c: usize> Harvester<s, c> for Visited<s, c> {
     type Output = u64;
 
     fn combine(results: &TreeResult<Self>) -> Self::Output {
-        results.values().map(|harv| harv.visited).sum()
+        results.iter().map(|harv| harv.visited).sum()
     }
 }
 
@@ -70,10 +70,10 @@ impl<const s: usize, const c: usize> Harvester<s, c>
 
     fn combine(results: &TreeResult<Self>) -> Self::Output {
         let mut progs = results
-            .values()
+            .iter()
             .flat_map(|harv| harv.progs.clone())
             .collect::<Vec<_>>();
-        let visited = results.values().map(|harv| harv.visited).sum();
+        let visited = results.iter().map(|harv| harv.visited).sum();
 
         progs.sort();
 
@@ -141,7 +141,7 @@ impl<const s: usize, const c: usize, const n: usize> Harvester<s, c>
             core::array::from_fn(|_| Vec::new());
         let mut visited = [0; n];
 
-        results.values().for_each(|harv| {
+        results.iter().for_each(|harv| {
             progs.iter_mut().zip(harv.progs.iter()).for_each(
                 |(acc, progs)| acc.extend(progs.iter().cloned()),
             );
@@ -205,7 +205,7 @@ impl<const s: usize, const c: usize> Harvester<s, c>
 
     fn combine(results: &TreeResult<Self>) -> Self::Output {
         results
-            .values()
+            .iter()
             .map(|harv| (harv.holdout, harv.visited))
             .fold((0, 0), |(acc1, acc2), (v1, v2)| {
                 (acc1 + v1, acc2 + v2)
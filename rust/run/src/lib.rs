@@ -0,0 +1,3 @@
+pub mod progress;
+pub mod stream;
+pub mod tree;
@@ -2,12 +2,13 @@
 #![expect(clippy::used_underscore_items, clippy::needless_for_each)]
 use rayon::prelude::*;
 
+use run::tree;
 use tm::{Goal, Prog, Steps};
 
 pub mod check;
+pub mod cli;
 pub mod harvesters;
 pub mod holdouts;
-pub mod tree;
 
 use check::{assert_holdouts_match, test_holdouts};
 use harvesters::{Collector, HoldoutVisited, MultiCollector, Visited};
@@ -524,6 +525,25 @@ const FAST: &[fn()] = &[test_deciders, test_quasihalt];
 const SLOW: &[fn()] = &[test_deciders_slow, test_9_instr];
 
 fn main() {
+    let args: Vec<String> = std::env::args().skip(1).collect();
+
+    if let Some((cmd @ ("sweep" | "coordinate"), rest)) =
+        args.split_first().map(|(cmd, rest)| (cmd.as_str(), rest))
+    {
+        let result = if cmd == "sweep" {
+            cli::sweep(rest)
+        } else {
+            cli::coordinate(rest)
+        };
+
+        if let Err(err) = result {
+            eprintln!("{err}");
+            std::process::exit(2);
+        }
+
+        return;
+    }
+
     test_bkw();
 
     if !std::env::args().any(|x| x == "--all") {
@@ -0,0 +1,190 @@
+use core::{
+    sync::atomic::{AtomicU64, Ordering::Relaxed},
+    time::Duration,
+};
+use std::{
+    io::{self, Write},
+    sync::mpsc::{Receiver, RecvTimeoutError},
+    time::Instant,
+};
+
+/**************************************/
+
+pub const PUBLISH: u64 = 1 << 12;
+
+#[derive(Default)]
+pub struct Tally {
+    pub nodes: u64,
+    pub leaves: u64,
+    pub holdouts: u64,
+    pub settled: Vec<u64>,
+}
+
+impl Tally {
+    pub fn new(deciders: usize) -> Self {
+        Self {
+            settled: vec![0; deciders],
+            ..Self::default()
+        }
+    }
+}
+
+/**************************************/
+
+pub struct Progress {
+    nodes: AtomicU64,
+    leaves: AtomicU64,
+    holdouts: AtomicU64,
+    settled: Vec<AtomicU64>,
+
+    deciders: Vec<String>,
+    expected: Option<u64>,
+    start: Instant,
+}
+
+impl Progress {
+    pub fn new(deciders: Vec<String>, expected: Option<u64>) -> Self {
+        Self {
+            nodes: AtomicU64::new(0),
+            leaves: AtomicU64::new(0),
+            holdouts: AtomicU64::new(0),
+            settled: deciders
+                .iter()
+                .map(|_| AtomicU64::new(0))
+                .collect(),
+            deciders,
+            expected,
+            start: Instant::now(),
+        }
+    }
+
+    pub const fn deciders(&self) -> usize {
+        self.deciders.len()
+    }
+
+    pub fn publish(&self, tally: &mut Tally) {
+        self.nodes.fetch_add(tally.nodes, Relaxed);
+        self.leaves.fetch_add(tally.leaves, Relaxed);
+        self.holdouts.fetch_add(tally.holdouts, Relaxed);
+
+        for (count, settled) in
+            self.settled.iter().zip(tally.settled.iter_mut())
+        {
+            count.fetch_add(*settled, Relaxed);
+            *settled = 0;
+        }
+
+        tally.nodes = 0;
+        tally.leaves = 0;
+        tally.holdouts = 0;
+    }
+
+    #[expect(clippy::cast_precision_loss)]
+    pub fn snapshot(&self) -> String {
+        let elapsed = self.start.elapsed().as_secs_f64();
+
+        let nodes = self.nodes.load(Relaxed);
+        let leaves = self.leaves.load(Relaxed);
+        let holdouts = self.holdouts.load(Relaxed);
+
+        let rate = |count: u64| {
+            if elapsed > 0.0 {
+                count as f64 / elapsed
+            } else {
+                0.0
+            }
+        };
+
+        let settled = self
+            .deciders
+            .iter()
+            .zip(&self.settled)
+            .map(|(name, count)| {
+                format!("\"{name}\": {}", count.load(Relaxed))
+            })
+            .collect::<Vec<_>>()
+            .join(", ");
+
+        let eta = self.expected.filter(|_| leaves > 0).map_or_else(
+            || "null".into(),
+            |expected| {
+                let left = expected.saturating_sub(leaves) as f64;
+                format!("{:.1}", left / rate(leaves))
+            },
+        );
+
+        format!(
+            "{{\"elapsed\": {elapsed:.3}, \
+             \"nodes\": {nodes}, \
+             \"leaves\": {leaves}, \
+             \"holdouts\": {holdouts}, \
+             \"nodes_per_sec\": {:.1}, \
+             \"leaves_per_sec\": {:.1}, \
+             \"settled\": {{{settled}}}, \
+             \"eta\": {eta}}}",
+            rate(nodes),
+            rate(leaves),
+        )
+    }
+}
+
+/**************************************/
+
+pub fn report(
+    progress: &Progress,
+    out: &mut dyn Write,
+    every: Duration,
+    stop: &Receiver<()>,
+) -> io::Result<()> {
+    loop {
+        let last = !matches!(
+            stop.recv_timeout(every),
+            Err(RecvTimeoutError::Timeout)
+        );
+
+        writeln!(out, "{}", progress.snapshot())?;
+
+        out.flush()?;
+
+        if last {
+            return Ok(());
+        }
+    }
+}
+
+/**************************************/
+
+#[test]
+fn test_progress() {
+    let progress = Progress::new(vec!["lin(100)".into()], Some(20));
+
+    let mut tally = Tally::new(progress.deciders());
+
+    tally.nodes = 30;
+    tally.leaves = 10;
+    tally.holdouts = 4;
+    tally.settled[0] = 6;
+
+    progress.publish(&mut tally);
+
+    assert_eq!(tally.nodes, 0);
+    assert_eq!(tally.settled, [0]);
+
+    let snapshot = progress.snapshot();
+
+    assert!(snapshot.starts_with("{\"elapsed\": "));
+    assert!(snapshot.contains("\"nodes\": 30, \"leaves\": 10"));
+    assert!(snapshot.contains("\"settled\": {\"lin(100)\": 6}"));
+    assert!(!snapshot.contains("\"eta\": null"));
+
+    let (stop, stopped) = std::sync::mpsc::channel();
+
+    drop(stop);
+
+    let mut out = vec![];
+
+    report(&progress, &mut out, Duration::from_secs(60), &stopped)
+        .unwrap();
+
+    assert_eq!(out.iter().filter(|&&byte| byte == b'\n').count(), 1);
+}
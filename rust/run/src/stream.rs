@@ -0,0 +1,505 @@
+use core::{fmt, mem};
+use std::{
+    collections::{HashMap as Map, HashSet as Set},
+    sync::mpsc::SyncSender,
+};
+
+use tm::{Goal, Prog, Steps, pipeline::Pipeline};
+
+use crate::{
+    progress::{PUBLISH, Progress, Tally},
+    tree::{Harvester, PassConfig, Shard, Split, TreeResult},
+};
+
+/**************************************/
+
+pub type Batch = Vec<String>;
+
+pub struct Done {
+    pub prefix: String,
+    pub holdouts: u64,
+    pub visited: u64,
+}
+
+impl Done {
+    pub fn read(line: &str) -> Option<Self> {
+        let mut fields = line.split('\t');
+
+        let prefix = fields.next()?.to_owned();
+        let holdouts = fields.next()?.parse().ok()?;
+        let visited = fields.next()?.parse().ok()?;
+
+        fields.next().is_none().then_some(Self {
+            prefix,
+            holdouts,
+            visited,
+        })
+    }
+}
+
+impl fmt::Display for Done {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        write!(
+            f,
+            "{}\t{}\t{}",
+            self.prefix, self.holdouts, self.visited
+        )
+    }
+}
+
+pub struct Flush {
+    pub progs: Batch,
+    pub done: Option<Done>,
+}
+
+/**************************************/
+
+pub struct Checkpoint {
+    pub depth: usize,
+    pub done: Set<String>,
+}
+
+pub struct Prefixes(Map<Vec<usize>, Set<String>>);
+
+impl Prefixes {
+    pub fn new<S>(done: &Set<String, S>) -> Self {
+        let mut masks: Map<Vec<usize>, Set<String>> = Map::new();
+
+        for prefix in done {
+            let instrs: Vec<&str> = prefix.split_whitespace().collect();
+
+            let mask: Vec<usize> = instrs
+                .iter()
+                .enumerate()
+                .filter(|&(_, &instr)| instr != "...")
+                .map(|(pos, _)| pos)
+                .collect();
+
+            let key = project(&instrs, &mask);
+
+            masks.entry(mask).or_default().insert(key);
+        }
+
+        Self(masks)
+    }
+
+    pub fn covers(&self, prog: &str) -> bool {
+        let instrs: Vec<&str> = prog.split_whitespace().collect();
+
+        self.0
+            .iter()
+            .any(|(mask, keys)| keys.contains(&project(&instrs, mask)))
+    }
+}
+
+fn project(instrs: &[&str], mask: &[usize]) -> String {
+    mask.iter()
+        .filter_map(|&pos| instrs.get(pos).copied())
+        .collect::<Vec<_>>()
+        .join(" ")
+}
+
+pub struct Filter {
+    pub lin: Option<Steps>,
+    pub pipeline: Option<Pipeline>,
+    pub batch: usize,
+    pub checkpoint: Option<Checkpoint>,
+    pub shard: Option<Shard>,
+    pub split: Split,
+    pub progress: Option<Progress>,
+}
+
+impl Filter {
+    pub fn deciders(&self) -> Vec<String> {
+        self.lin
+            .map(|lin| format!("lin({lin})"))
+            .into_iter()
+            .chain(self.pipeline.iter().flat_map(|pipeline| {
+                pipeline.stages.iter().map(ToString::to_string)
+            }))
+            .collect()
+    }
+
+    fn settles<const s: usize, const c: usize>(
+        &self,
+        prog: &Prog<s, c>,
+        config: &mut PassConfig<'_>,
+    ) -> Option<usize> {
+        if let Some(lin) = self.lin
+            && prog.term_or_rec(lin, config.to_mut()).is_settled()
+        {
+            return Some(0);
+        }
+
+        let offset = usize::from(self.lin.is_some());
+
+        self.pipeline
+            .as_ref()?
+            .run_from(prog, config.to_mut())
+            .settled
+            .map(|stage| offset + stage)
+    }
+}
+
+/**************************************/
+
+pub struct Streamer<'f, const s: usize, const c: usize> {
+    filter: &'f Filter,
+    progs: Batch,
+    sender: Option<SyncSender<Flush>>,
+
+    visited: u64,
+    holdouts: u64,
+
+    marked: (u64, u64),
+    adopted: (u64, u64),
+
+    tally: Tally,
+}
+
+impl<'f, const s: usize, const c: usize> Streamer<'f, s, c> {
+    pub fn new(filter: &'f Filter, sender: SyncSender<Flush>) -> Self {
+        Self {
+            filter,
+            progs: Batch::with_capacity(filter.batch),
+            sender: Some(sender),
+            visited: 0,
+            holdouts: 0,
+            marked: (0, 0),
+            adopted: (0, 0),
+            tally: Tally::new(
+                filter.progress.as_ref().map_or(0, Progress::deciders),
+            ),
+        }
+    }
+
+    fn send(&mut self, done: Option<Done>) {
+        let progs = mem::take(&mut self.progs);
+
+        if self.sender.as_ref().is_some_and(|sender| {
+            sender.send(Flush { progs, done }).is_err()
+        }) {
+            self.sender = None;
+        }
+    }
+
+    fn flush(&mut self) {
+        if self.progs.is_empty() {
+            return;
+        }
+
+        self.send(None);
+    }
+
+    fn unreported(&mut self) -> (u64, u64) {
+        let (holdouts, visited) = self.marked;
+        let (adopted_holdouts, adopted_visited) =
+            mem::take(&mut self.adopted);
+
+        self.marked = (self.holdouts, self.visited);
+
+        (
+            self.holdouts - holdouts + adopted_holdouts,
+            self.visited - visited + adopted_visited,
+        )
+    }
+
+    fn checkpoint(&self, depth: usize) -> Option<&'f Checkpoint> {
+        self.filter
+            .checkpoint
+            .as_ref()
+            .filter(|checkpoint| depth <= checkpoint.depth)
+    }
+}
+
+impl<const s: usize, const c: usize> Drop for Streamer<'_, s, c> {
+    fn drop(&mut self) {
+        self.flush();
+
+        if let Some(progress) = &self.filter.progress {
+            progress.publish(&mut self.tally);
+        }
+    }
+}
+
+impl<const s: usize, const c: usize> Harvester<s, c>
+    for Streamer<'_, s, c>
+{
+    fn harvest(
+        &mut self,
+        prog: &Prog<s, c>,
+        config: &mut PassConfig<'_>,
+    ) {
+        if self.sender.is_none() {
+            return;
+        }
+
+        self.visited += 1;
+        self.tally.leaves += 1;
+
+        if let Some(decider) = self.filter.settles(prog, config) {
+            if let Some(settled) = self.tally.settled.get_mut(decider) {
+                *settled += 1;
+            }
+
+            return;
+        }
+
+        self.holdouts += 1;
+        self.tally.holdouts += 1;
+
+        self.progs.push(prog.to_string());
+
+        if self.progs.len() >= self.filter.batch {
+            self.flush();
+        }
+    }
+
+    fn skip(&self, prefix: &Prog<s, c>, depth: usize) -> bool {
+        self.checkpoint(depth).is_some_and(|checkpoint| {
+            checkpoint.done.contains(&prefix.to_string())
+        })
+    }
+
+    fn finish(&mut self, prefix: &Prog<s, c>, depth: usize) {
+        if self.sender.is_none() || self.checkpoint(depth).is_none() {
+            return;
+        }
+
+        self.flush();
+
+        let (holdouts, visited) = self.unreported();
+
+        let done = Done {
+            prefix: prefix.to_string(),
+            holdouts,
+            visited,
+        };
+
+        self.send(Some(done));
+    }
+
+    fn adopt(&mut self, fork: &mut Self) {
+        fork.flush();
+
+        let (holdouts, visited) = fork.unreported();
+
+        self.adopted.0 += holdouts;
+        self.adopted.1 += visited;
+    }
+
+    fn shard(&self) -> Option<Shard> {
+        self.filter.shard
+    }
+
+    fn split(&self) -> Split {
+        self.filter.split
+    }
+
+    fn visit(&mut self) {
+        let Some(progress) = &self.filter.progress else {
+            return;
+        };
+
+        self.tally.nodes += 1;
+
+        if self.tally.nodes >= PUBLISH {
+            progress.publish(&mut self.tally);
+        }
+    }
+
+    type Output = (u64, u64);
+
+    fn combine(results: &TreeResult<Self>) -> Self::Output {
+        results
+            .iter()
+            .map(|harv| (harv.holdouts, harv.visited))
+            .fold((0, 0), |(acc1, acc2), (v1, v2)| {
+                (acc1 + v1, acc2 + v2)
+            })
+    }
+}
+
+/**************************************/
+
+pub type Stream =
+    fn(Option<Goal>, Steps, &Filter, &SyncSender<Flush>) -> (u64, u64);
+
+fn stream<const s: usize, const c: usize>(
+    goal: Option<Goal>,
+    sim_lim: Steps,
+    filter: &Filter,
+    sender: &SyncSender<Flush>,
+) -> (u64, u64) {
+    Streamer::<s, c>::run_params(goal, sim_lim, &|| {
+        Streamer::new(filter, sender.clone())
+    })
+}
+
+pub fn get_stream(states: usize, colors: usize) -> Option<Stream> {
+    Some(match (states, colors) {
+        (2, 2) => stream::<2, 2>,
+        (2, 3) => stream::<2, 3>,
+        (3, 2) => stream::<3, 2>,
+        (2, 4) => stream::<2, 4>,
+        (3, 3) => stream::<3, 3>,
+        (4, 2) => stream::<4, 2>,
+        (2, 5) => stream::<2, 5>,
+        (5, 2) => stream::<5, 2>,
+        _ => return None,
+    })
+}
+
+/**************************************/
+
+#[cfg(test)]
+fn sweep<const s: usize, const c: usize>(
+    sim_lim: Steps,
+    filter: &Filter,
+) -> (Vec<Flush>, (u64, u64)) {
+    use std::{sync::mpsc::sync_channel, thread};
+
+    let (sender, receiver) = sync_channel(16);
+
+    thread::scope(|scope| {
+        let tree = scope.spawn(move || {
+            stream::<s, c>(None, sim_lim, filter, &sender)
+        });
+
+        let flushes = receiver.iter().collect();
+
+        (flushes, tree.join().unwrap())
+    })
+}
+
+#[cfg(test)]
+fn sum_done(flushes: &[Flush]) -> (u64, u64) {
+    flushes.iter().filter_map(|flush| flush.done.as_ref()).fold(
+        (0, 0),
+        |(acc1, acc2), done| {
+            (acc1 + done.holdouts, acc2 + done.visited)
+        },
+    )
+}
+
+#[cfg(test)]
+fn assert_resume<const s: usize, const c: usize>(
+    sim_lim: Steps,
+    batch: usize,
+    split: Split,
+) {
+    let filter = |done| Filter {
+        lin: None,
+        pipeline: None,
+        batch,
+        checkpoint: Some(Checkpoint { depth: 2, done }),
+        shard: None,
+        split,
+        progress: None,
+    };
+
+    let (flushes, (holdouts, visited)) =
+        sweep::<s, c>(sim_lim, &filter(Set::new()));
+
+    assert_eq!(sum_done(&flushes), (holdouts, visited));
+
+    let ends: Vec<usize> = flushes
+        .iter()
+        .enumerate()
+        .filter_map(|(index, flush)| flush.done.as_ref().map(|_| index))
+        .collect();
+
+    let (kept, _) = flushes.split_at(1 + ends[ends.len() / 2]);
+
+    let done: Set<String> = kept
+        .iter()
+        .filter_map(|flush| flush.done.as_ref())
+        .map(|done| done.prefix.clone())
+        .collect();
+
+    let (rest, (rest_holdouts, rest_visited)) =
+        sweep::<s, c>(sim_lim, &filter(done.clone()));
+
+    let (kept_holdouts, kept_visited) = sum_done(kept);
+
+    assert_eq!(holdouts, kept_holdouts + rest_holdouts);
+    assert_eq!(visited, kept_visited + rest_visited);
+
+    let progs = |flushes: &[Flush]| -> Vec<String> {
+        flushes
+            .iter()
+            .flat_map(|flush| flush.progs.iter().cloned())
+            .collect()
+    };
+
+    let prefixes = Prefixes::new(&done);
+
+    let mut full = progs(&flushes);
+
+    let mut resumed = [
+        progs(kept)
+            .into_iter()
+            .filter(|prog| prefixes.covers(prog))
+            .collect::<Vec<_>>(),
+        progs(&rest),
+    ]
+    .concat();
+
+    full.sort();
+    resumed.sort();
+
+    assert_eq!(full, resumed);
+}
+
+#[test]
+fn test_resume() {
+    use crate::tree::SPLIT;
+
+    assert_resume::<2, 3>(100, 1, SPLIT);
+    assert_resume::<4, 2>(20, 100, SPLIT);
+    assert_resume::<4, 2>(20, 100, Split { slots: 2, ..SPLIT });
+
+    let done = Done::read("1RB 1LA  ... ...\t2\t5").unwrap();
+
+    assert_eq!(done.to_string(), "1RB 1LA  ... ...\t2\t5");
+
+    assert!(Done::read("1RB 1LA  ... ...\t2").is_none());
+}
+
+#[test]
+fn test_shards() {
+    let filter = |shard| Filter {
+        lin: None,
+        pipeline: None,
+        batch: 1_000,
+        checkpoint: None,
+        shard,
+        split: crate::tree::SPLIT,
+        progress: None,
+    };
+
+    let (_, total) = sweep::<2, 3>(100, &filter(None));
+
+    let count = 3;
+
+    let shards = (0..count)
+        .map(|index| {
+            sweep::<2, 3>(
+                100,
+                &filter(Some(Shard {
+                    depth: 2,
+                    index,
+                    count,
+                })),
+            )
+            .1
+        })
+        .collect::<Vec<_>>();
+
+    assert_eq!(
+        total,
+        shards.iter().fold((0, 0), |(acc1, acc2), (v1, v2)| {
+            (acc1 + v1, acc2 + v2)
+        }),
+    );
+}
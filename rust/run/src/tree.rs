@@ -1,7 +1,7 @@
 #![expect(clippy::trivially_copy_pass_by_ref)]
 
 use core::cmp::{max, min};
-use std::{borrow::Cow, collections::HashMap as Dict};
+use std::borrow::Cow;
 
 use rayon::prelude::*;
 
@@ -12,7 +12,7 @@ use tm::{
 
 pub type PassConfig<'c> = Cow<'c, Config>;
 
-pub type TreeResult<Harv> = Dict<Instr, Harv>;
+pub type TreeResult<Harv> = Vec<Harv>;
 
 type Slots = usize;
 
@@ -92,6 +92,7 @@ fn make_spinout_table<
 
 /**************************************/
 
+#[derive(Clone)]
 struct AvailStack<T>(Vec<T>);
 
 impl<T: Copy> AvailStack<T> {
@@ -153,7 +154,9 @@ impl AvailParams {
 
 /**************************************/
 
-trait AvailInstrs<'h, const states: usize, const colors: usize> {
+trait AvailInstrs<'h, const states: usize, const colors: usize>:
+    Clone + Send + Sync
+{
     type Table: Sync;
 
     fn new(instr_table: &'h Self::Table) -> Self;
@@ -164,6 +167,7 @@ trait AvailInstrs<'h, const states: usize, const colors: usize> {
     fn on_remove(&mut self) {}
 }
 
+#[derive(Clone)]
 struct BasicInstrs<'h> {
     instr_table: &'h InstrTable,
     avail_params: AvailParams,
@@ -198,6 +202,7 @@ impl<'h, const states: usize, const colors: usize>
     }
 }
 
+#[derive(Clone)]
 struct AvailBlanks(AvailStack<Option<Slots>>);
 
 impl AvailBlanks {
@@ -226,6 +231,7 @@ impl AvailBlanks {
     }
 }
 
+#[derive(Clone)]
 struct BlankInstrs<'h> {
     instr_table: &'h InstrTable,
     avail_params: AvailParams,
@@ -274,6 +280,7 @@ impl<'h, const states: usize, const colors: usize>
     }
 }
 
+#[derive(Clone)]
 struct AvailSpinouts(AvailStack<Option<Slots>>);
 
 impl AvailSpinouts {
@@ -304,6 +311,7 @@ impl AvailSpinouts {
     }
 }
 
+#[derive(Clone)]
 struct SpinoutInstrs<'h> {
     instr_table: &'h SpinoutInstrTable,
     avail_params: AvailParams,
@@ -353,6 +361,7 @@ impl<'h, const states: usize, const colors: usize>
     }
 }
 
+#[derive(Clone)]
 struct BasicInstrsSmall<'h, const STATES: usize, const COLORS: usize> {
     instrs: &'h [Instr],
 }
@@ -374,6 +383,7 @@ impl<'h, const states: usize, const colors: usize>
     }
 }
 
+#[derive(Clone)]
 struct BlankInstrsSmall<'h, const states: usize, const colors: usize> {
     instrs_all: &'h [Instr],
     instrs_erase: &'h [Instr],
@@ -418,41 +428,108 @@ impl<'h, const states: usize, const colors: usize>
 
 /**************************************/
 
-struct Tree<const states: usize, const colors: usize, AvIn, Harv> {
+#[derive(Clone, Copy)]
+pub struct Shard {
+    pub depth: usize,
+    pub index: u64,
+    pub count: u64,
+}
+
+impl Shard {
+    fn owns<const s: usize, const c: usize>(
+        &self,
+        prefix: &Prog<s, c>,
+    ) -> bool {
+        fnv(&prefix.to_string()) % self.count == self.index
+    }
+}
+
+const FNV_OFFSET: u64 = 0xcbf2_9ce4_8422_2325;
+const FNV_PRIME: u64 = 0x0100_0000_01b3;
+
+fn fnv(text: &str) -> u64 {
+    text.bytes().fold(FNV_OFFSET, |hash, byte| {
+        (hash ^ u64::from(byte)).wrapping_mul(FNV_PRIME)
+    })
+}
+
+/**************************************/
+
+#[derive(Clone, Copy)]
+pub struct Split {
+    pub depth: usize,
+    pub slots: usize,
+}
+
+pub const SPLIT: Split = Split { depth: 3, slots: 4 };
+
+struct Tree<'f, const states: usize, const colors: usize, AvIn, Harv> {
     prog: Prog<states, colors>,
     instrs: AvIn,
     sim_lim: Steps,
     remaining_slots: Slots,
+    depth: usize,
+    split: Split,
+    shard: Option<Shard>,
     harvester: Harv,
+    forks: Vec<Harv>,
+    make: &'f (dyn Fn() -> Harv + Sync),
 }
 
 impl<
     'i,
+    'f,
     const states: usize,
     const colors: usize,
     AvIn: AvailInstrs<'i, states, colors>,
     Harv: Harvester<states, colors>,
-> Tree<states, colors, AvIn, Harv>
+> Tree<'f, states, colors, AvIn, Harv>
 {
-    const fn init(
+    fn init(
         halt: Slots,
         sim_lim: Steps,
-        harvester: Harv,
         instrs: AvIn,
+        make: &'f (dyn Fn() -> Harv + Sync),
     ) -> Self {
         let prog = Prog::<states, colors>::init_norm();
 
         let remaining_slots = (states * colors) - halt - 2;
 
+        let harvester = make();
+
         Self {
             prog,
             instrs,
             sim_lim,
             remaining_slots,
+            depth: 0,
+            split: harvester.split(),
+            shard: harvester.shard(),
             harvester,
+            forks: vec![],
+            make,
         }
     }
 
+    fn owns(&self) -> bool {
+        self.shard.is_none_or(|shard| {
+            self.depth != shard.depth || shard.owns(&self.prog)
+        })
+    }
+
+    const fn splits(&self) -> bool {
+        self.depth < self.split.depth
+            && self.split.slots <= self.remaining_slots
+    }
+
+    fn harvesters(self) -> Vec<Harv> {
+        let mut harvesters = self.forks;
+
+        harvesters.push(self.harvester);
+
+        harvesters
+    }
+
     const fn final_slot(&self) -> bool {
         self.remaining_slots == 0
     }
@@ -465,11 +542,25 @@ impl<
         matches!(self.run(config), StepLimit)
     }
 
+    fn shared(&self) -> bool {
+        self.shard.is_some_and(|shard| {
+            self.depth < shard.depth && shard.index != 0
+        })
+    }
+
     fn harvest(&mut self, config: &mut PassConfig<'_>) {
+        if self.shared() {
+            return;
+        }
+
         self.harvester.harvest(&self.prog, config);
     }
 
     fn branch(&mut self, mut config: Config) {
+        if !self.shared() {
+            self.harvester.visit();
+        }
+
         let slot @ (slot_state, _) = match self.run(&mut config) {
             Undefined(slot) => slot,
             Blank | Spinout => return,
@@ -520,29 +611,77 @@ impl<
 
         self.remaining_slots -= 1;
 
-        for next_instr in instrs {
-            self.prog.insert(&slot, next_instr);
+        if self.splits() {
+            self.fork(&slot, &avail_instrs, &config);
+        } else {
+            for next_instr in instrs {
+                self.descend(&slot, next_instr, config.clone());
+            }
 
-            self.instrs.on_insert(&slot, next_instr);
+            self.descend(&slot, last_instr, config);
+        }
 
-            self.branch(config.clone());
+        self.prog.remove(&slot);
 
-            self.instrs.on_remove();
-        }
+        self.remaining_slots += 1;
+    }
 
-        {
-            self.prog.insert(&slot, last_instr);
+    fn descend(&mut self, slot: &Slot, instr: &Instr, config: Config) {
+        self.prog.insert(slot, instr);
 
-            self.instrs.on_insert(&slot, last_instr);
+        self.depth += 1;
+
+        if self.owns() && !self.harvester.skip(&self.prog, self.depth) {
+            self.instrs.on_insert(slot, instr);
 
             self.branch(config);
 
             self.instrs.on_remove();
+
+            self.harvester.finish(&self.prog, self.depth);
         }
 
-        self.prog.remove(&slot);
+        self.depth -= 1;
+    }
 
-        self.remaining_slots += 1;
+    fn fork(&mut self, slot: &Slot, instrs: &[Instr], config: &Config) {
+        let (prog, avail, make) = (&self.prog, &self.instrs, self.make);
+
+        let (sim_lim, remaining_slots, depth, split, shard) = (
+            self.sim_lim,
+            self.remaining_slots,
+            self.depth,
+            self.split,
+            self.shard,
+        );
+
+        let mut forks: Vec<Harv> = instrs
+            .par_iter()
+            .flat_map_iter(|instr| {
+                let mut fork = Self {
+                    prog: prog.clone(),
+                    instrs: avail.clone(),
+                    sim_lim,
+                    remaining_slots,
+                    depth,
+                    split,
+                    shard,
+                    harvester: make(),
+                    forks: vec![],
+                    make,
+                };
+
+                fork.descend(slot, instr, config.clone());
+
+                fork.harvesters()
+            })
+            .collect();
+
+        for fork in &mut forks {
+            self.harvester.adopt(fork);
+        }
+
+        self.forks.append(&mut forks);
     }
 
     fn run_branch(
@@ -554,21 +693,26 @@ impl<
     ) -> TreeResult<Harv> {
         init_instrs
             .par_iter()
-            .map(|instr| {
-                let mut tree = Self::init(
+            .flat_map_iter(|instr| {
+                let mut tree = Tree::init(
                     halt,
                     sim_lim,
-                    harvester(),
                     AvIn::new(instr_table),
+                    &harvester,
                 );
 
                 tree.remaining_slots -= 1;
                 tree.prog.insert(&INIT_SLOT, instr);
-                tree.instrs.on_insert(&INIT_SLOT, instr);
 
-                tree.branch(Config::init_stepped());
+                if tree.owns() && !tree.harvester.skip(&tree.prog, 0) {
+                    tree.instrs.on_insert(&INIT_SLOT, instr);
+
+                    tree.branch(Config::init_stepped());
 
-                (*instr, tree.harvester)
+                    tree.harvester.finish(&tree.prog, 0);
+                }
+
+                tree.harvesters()
             })
             .collect()
     }
@@ -577,19 +721,19 @@ impl<
 const INIT_SLOT: Slot = (1, 0);
 
 type BasicTree<'i, const s: usize, const c: usize, H> =
-    Tree<s, c, BasicInstrs<'i>, H>;
+    Tree<'i, s, c, BasicInstrs<'i>, H>;
 
 type BasicTreeSmall<'i, const s: usize, const c: usize, H> =
-    Tree<s, c, BasicInstrsSmall<'i, s, c>, H>;
+    Tree<'i, s, c, BasicInstrsSmall<'i, s, c>, H>;
 
 type BlankTree<'i, const s: usize, const c: usize, H> =
-    Tree<s, c, BlankInstrs<'i>, H>;
+    Tree<'i, s, c, BlankInstrs<'i>, H>;
 
 type BlankTreeSmall<'i, const s: usize, const c: usize, H> =
-    Tree<s, c, BlankInstrsSmall<'i, s, c>, H>;
+    Tree<'i, s, c, BlankInstrsSmall<'i, s, c>, H>;
 
 type SpinoutTree<'i, const s: usize, const c: usize, H> =
-    Tree<s, c, SpinoutInstrs<'i>, H>;
+    Tree<'i, s, c, SpinoutInstrs<'i>, H>;
 
 /**************************************/
 
@@ -606,6 +750,33 @@ pub trait Harvester<const states: usize, const colors: usize>:
 
     fn combine(results: &TreeResult<Self>) -> Self::Output;
 
+    fn skip(
+        &self,
+        _prefix: &Prog<states, colors>,
+        _depth: usize,
+    ) -> bool {
+        false
+    }
+
+    fn finish(
+        &mut self,
+        _prefix: &Prog<states, colors>,
+        _depth: usize,
+    ) {
+    }
+
+    fn adopt(&mut self, _fork: &mut Self) {}
+
+    fn shard(&self) -> Option<Shard> {
+        None
+    }
+
+    fn split(&self) -> Split {
+        SPLIT
+    }
+
+    fn visit(&mut self) {}
+
     fn run_params(
         goal: Option<Goal>,
         sim_lim: Steps,
@@ -7,8 +7,8 @@ use core::{
 use ahash::{AHashMap as Dict, AHashSet as Set, AHasher};
 
 use crate::{
-    Color, Instr, Prog, Shift, Slot, State, Steps, instrs::Parse as _,
-    tape::Scan,
+    Color, Instr, Prog, Shift, Slot, State, Steps, budget,
+    instrs::Parse as _, tape::Scan,
 };
 
 const MAX_STACK_DEPTH: usize = 64;
@@ -881,6 +881,10 @@ fn cant_reach<const s: usize, const c: usize, T: Ord>(
     let mut seen: Set<(State, u64)> = Set::new();
 
     for step in 1..=steps {
+        if !budget::spend(1) {
+            return StepLimit;
+        }
+
         configs.retain(|Config { state, tape }| {
             let blank_ends = tape.lspan.end == TapeEnd::Blanks
                 && tape.rspan.end == TapeEnd::Blanks;
@@ -12,9 +12,13 @@ type UnrolledTape = Vec<Color>;
 
 impl<const s: usize, const c: usize> Prog<s, c> {
     pub fn opt_block(&self, steps: Steps) -> usize {
+        self.rank_blocks(steps)[0].0
+    }
+
+    pub fn rank_blocks(&self, steps: Steps) -> Vec<(usize, usize)> {
         let unrolled = self.unroll_at_max_blocks(steps);
 
-        get_compr(&unrolled)
+        rank_compr(&unrolled)
     }
 }
 
@@ -147,19 +151,18 @@ fn compr_eff(tape: &UnrolledTape, k: usize) -> usize {
     compr_size
 }
 
-fn get_compr(tape: &UnrolledTape) -> usize {
-    let mut opt_size = 1;
-    let mut min_comp = 1 + tape.len();
+fn rank_compr(tape: &UnrolledTape) -> Vec<(usize, usize)> {
+    let mut ranks: Vec<(usize, usize)> = (1..tape.len() / 2)
+        .map(|block_size| (block_size, compr_eff(tape, block_size)))
+        .collect();
 
-    for block_size in 1..tape.len() / 2 {
-        let compr_size = compr_eff(tape, block_size);
-        if compr_size < min_comp {
-            min_comp = compr_size;
-            opt_size = block_size;
-        }
+    if ranks.is_empty() {
+        ranks.push((1, tape.len()));
     }
 
-    opt_size
+    ranks.sort_by_key(|&(_, compr_size)| compr_size);
+
+    ranks
 }
 
 /**************************************/
@@ -170,3 +173,19 @@ fn test_opt_block() {
 
     assert_eq!(prog.opt_block(500), 2);
 }
+
+#[test]
+fn test_rank_blocks() {
+    let prog = Prog::<4, 2>::from("1RB 0LB  0LC 0LA  1RD 1LC  0RC 1RA");
+
+    let ranks = prog.rank_blocks(500);
+
+    assert_eq!(ranks[0].0, prog.opt_block(500));
+
+    assert!(ranks.is_sorted_by_key(|&(_, compr_size)| compr_size));
+
+    assert!(matches!(
+        Prog::<2, 2>::from("1RB ...  ... ...").rank_blocks(10)[..],
+        [(1, _)]
+    ));
+}
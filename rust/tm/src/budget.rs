@@ -0,0 +1,214 @@
+use core::{
+    cell::{Cell, RefCell},
+    sync::atomic::{AtomicBool, Ordering::Relaxed},
+};
+use std::{sync::Arc, time::Instant};
+
+/**************************************/
+
+/// How often (in work units) the deadline and the cancellation token
+/// are polled.  Reading the clock on every unit would dominate the
+/// cheaper decider loops.
+const CHECK: u64 = 1 << 10;
+
+#[derive(Clone, Default)]
+pub struct Budget {
+    pub work: Option<u64>,
+    pub deadline: Option<Instant>,
+    pub cancel: Option<Arc<AtomicBool>>,
+}
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum Outcome {
+    Proved,
+    Unproved,
+    Exhausted,
+}
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub struct Report {
+    pub outcome: Outcome,
+    pub work: u64,
+}
+
+/**************************************/
+
+struct Meter {
+    spent: u64,
+    limit: u64,
+    check: u64,
+    exhausted: bool,
+    deadline: Option<Instant>,
+    cancel: Option<Arc<AtomicBool>>,
+}
+
+impl Meter {
+    fn new(budget: &Budget) -> Self {
+        Self {
+            spent: 0,
+            limit: budget.work.unwrap_or(u64::MAX),
+            check: 0,
+            exhausted: false,
+            deadline: budget.deadline,
+            cancel: budget.cancel.clone(),
+        }
+    }
+
+    fn spend(&mut self, units: u64) -> bool {
+        if self.exhausted {
+            return false;
+        }
+
+        let spent = self.spent.saturating_add(units);
+
+        if spent > self.limit {
+            self.exhausted = true;
+            return false;
+        }
+
+        self.spent = spent;
+
+        if self.spent >= self.check {
+            self.check = self.spent.saturating_add(CHECK);
+
+            self.exhausted = self
+                .deadline
+                .is_some_and(|deadline| deadline <= Instant::now())
+                || self
+                    .cancel
+                    .as_ref()
+                    .is_some_and(|cancel| cancel.load(Relaxed));
+        }
+
+        !self.exhausted
+    }
+}
+
+thread_local! {
+    static METER: RefCell<Option<Meter>> = const { RefCell::new(None) };
+
+    /// Whether `METER` is set, so that unbudgeted deciders can skip
+    /// the borrow in their innermost loops.
+    static METERED: Cell<bool> = const { Cell::new(false) };
+}
+
+/// Charge units of work against the budget of the decider running on
+/// this thread.  Returns `false` once the budget is used up, the
+/// deadline has passed, or the run has been cancelled; the caller
+/// should then give up as though it had hit its own limit.  Outside
+/// of `Budget::run` every call succeeds.
+#[inline]
+pub fn spend(units: u64) -> bool {
+    if !METERED.get() {
+        return true;
+    }
+
+    METER.with_borrow_mut(|meter| {
+        meter.as_mut().is_none_or(|meter| meter.spend(units))
+    })
+}
+
+impl Budget {
+    pub const fn is_unlimited(&self) -> bool {
+        self.work.is_none()
+            && self.deadline.is_none()
+            && self.cancel.is_none()
+    }
+
+    pub fn run(&self, decider: impl FnOnce() -> bool) -> Report {
+        let outer = METER.replace(Some(Meter::new(self)));
+
+        let metered = METERED.replace(true);
+
+        let proved = decider();
+
+        METERED.set(metered);
+
+        let Some(meter) = METER.replace(outer) else {
+            unreachable!()
+        };
+
+        // Nested runs still count against the enclosing budget.
+        spend(meter.spent);
+
+        let outcome = if proved {
+            Outcome::Proved
+        } else if meter.exhausted {
+            Outcome::Exhausted
+        } else {
+            Outcome::Unproved
+        };
+
+        Report {
+            outcome,
+            work: meter.spent,
+        }
+    }
+}
+
+/**************************************/
+
+#[cfg(test)]
+fn count(limit: u64) -> bool {
+    (0..limit).all(|_| spend(1))
+}
+
+#[test]
+fn test_budget() {
+    let unlimited = Budget::default();
+
+    assert!(unlimited.is_unlimited());
+
+    assert_eq!(
+        unlimited.run(|| count(5_000)),
+        Report {
+            outcome: Outcome::Proved,
+            work: 5_000,
+        },
+    );
+
+    let capped = Budget {
+        work: Some(100),
+        ..Budget::default()
+    };
+
+    assert_eq!(
+        capped.run(|| count(5_000)),
+        Report {
+            outcome: Outcome::Exhausted,
+            work: 100,
+        },
+    );
+
+    assert_eq!(capped.run(|| false).outcome, Outcome::Unproved);
+
+    let cancel = Arc::new(AtomicBool::new(true));
+
+    let cancelled = Budget {
+        cancel: Some(Arc::clone(&cancel)),
+        ..Budget::default()
+    };
+
+    assert_eq!(
+        cancelled.run(|| count(5_000)).outcome,
+        Outcome::Exhausted
+    );
+
+    cancel.store(false, Relaxed);
+
+    assert_eq!(cancelled.run(|| count(5_000)).outcome, Outcome::Proved);
+
+    let expired = Budget {
+        deadline: Some(Instant::now()),
+        ..Budget::default()
+    };
+
+    assert_eq!(
+        expired.run(|| count(5_000)).outcome,
+        Outcome::Exhausted
+    );
+
+    assert!(spend(u64::MAX));
+
+    assert!(!METERED.get());
+}
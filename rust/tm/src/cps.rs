@@ -1,29 +1,139 @@
-use core::fmt;
+use core::{fmt, iter::once};
 use std::collections::hash_map::Entry;
 
 use ahash::{AHashMap as Dict, AHashSet as Set};
 
-use crate::{Color, Goal, Prog, Shift, config, macros::GetInstr};
+use crate::{
+    Color, Goal, Prog, Shift, budget, config,
+    macros::{GetInstr, HistoryMacro},
+};
 
 use Goal::*;
 
 pub type Radius = usize;
 
+const TRANSCRIPTS: [usize; 3] = [1, 4, 16];
+
+/**************************************/
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum CpsMacro {
+    Base,
+    Transcript(usize),
+    Lru,
+}
+
+/// The radius, tape macro and tail-signature level at which a CPS
+/// closure was found.  Verifying replays that single closure instead
+/// of escalating through every smaller radius and every macro.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub struct CpsCert {
+    pub seg: Radius,
+    pub via: CpsMacro,
+    pub level: usize,
+}
+
+impl CpsCert {
+    pub fn read(cert: &str) -> Option<Self> {
+        let mut fields = cert.split(' ');
+
+        let seg = fields.next()?.parse().ok()?;
+
+        let via = match fields.next()? {
+            "base" => CpsMacro::Base,
+            "lru" => CpsMacro::Lru,
+            steps => CpsMacro::Transcript(steps.parse().ok()?),
+        };
+
+        let level = fields.next()?.parse().ok()?;
+
+        fields.next().is_none().then_some(Self { seg, via, level })
+    }
+}
+
+impl fmt::Display for CpsCert {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        write!(f, "{} ", self.seg)?;
+
+        match self.via {
+            CpsMacro::Base => write!(f, "base")?,
+            CpsMacro::Transcript(steps) => write!(f, "{steps}")?,
+            CpsMacro::Lru => write!(f, "lru")?,
+        }
+
+        write!(f, " {}", self.level)
+    }
+}
+
 const MAX_DEPTH: usize = 10_000;
 
 /**************************************/
 
 impl<const s: usize, const c: usize> Prog<s, c> {
     pub fn cps_cant_halt(&self, rad: Radius) -> bool {
-        self.cps_run_macros(rad, Halt)
+        self.cps_certify(rad, Halt).is_some()
     }
 
     pub fn cps_cant_blank(&self, rad: Radius) -> bool {
-        self.cps_run_macros(rad, Blank)
+        self.cps_certify(rad, Blank).is_some()
     }
 
     pub fn cps_cant_spinout(&self, rad: Radius) -> bool {
-        self.cps_run_macros(rad, Spinout)
+        self.cps_certify(rad, Spinout).is_some()
+    }
+
+    pub fn cps_certify(
+        &self,
+        rad: Radius,
+        goal: Goal,
+    ) -> Option<CpsCert> {
+        assert!(rad > 1);
+
+        let mut configs = Configs::new(goal);
+
+        let macros = self.history_macros(&TRANSCRIPTS);
+
+        (2..rad).find_map(|seg| {
+            let cert = |via, level| CpsCert { seg, via, level };
+
+            cps_cant_reach(self, seg, goal, &mut configs)
+                .map(|level| cert(CpsMacro::Base, level))
+                .or_else(|| {
+                    macros.iter().enumerate().find_map(|(i, prog)| {
+                        prog.reset();
+
+                        let via = TRANSCRIPTS
+                            .get(i)
+                            .map_or(CpsMacro::Lru, |&steps| {
+                                CpsMacro::Transcript(steps)
+                            });
+
+                        cps_cant_reach(prog, seg, goal, &mut configs)
+                            .map(|level| cert(via, level))
+                    })
+                })
+        })
+    }
+
+    pub fn cps_verify(&self, goal: Goal, cert: &CpsCert) -> bool {
+        if cert.seg < 2 || TAIL_SIG_REFINEMENTS.len() < cert.level {
+            return false;
+        }
+
+        match cert.via {
+            CpsMacro::Base => cps_replay(self, goal, cert),
+            CpsMacro::Transcript(steps) => {
+                TRANSCRIPTS.contains(&steps)
+                    && cps_replay(
+                        &self.make_transcript_macro(steps),
+                        goal,
+                        cert,
+                    )
+            },
+            CpsMacro::Lru => {
+                cps_replay(&self.make_lru_macro(), goal, cert)
+            },
+        }
     }
 
     /// Sound-but-incomplete CPS-based certifier for non-quasihalting,
@@ -52,47 +162,35 @@ impl<const s: usize, const c: usize> Prog<s, c> {
         let mut configs = Configs::new(Halt);
         let mut qh = QuasihaltScratch::default();
 
+        let macros = self.history_macros(&[1, 2, 3, 4, 5, 6, 7]);
+
         (2..rad).any(|seg| {
-            (1..8).any(|tr| {
+            macros.iter().any(|prog| {
+                prog.reset();
+
                 cps_cant_quasihalt(
-                    &self.make_transcript_macro(tr),
+                    prog,
                     seg,
                     ignored_state,
                     &mut configs,
                     &mut qh,
                 )
-            }) || cps_cant_quasihalt(
-                &self.make_lru_macro(),
-                seg,
-                ignored_state,
-                &mut configs,
-                &mut qh,
-            )
+            })
         })
     }
 
-    fn cps_run_macros(&self, rad: Radius, goal: Goal) -> bool {
-        assert!(rad > 1);
-
-        let mut configs = Configs::new(goal);
-
-        (2..rad).any(|seg| {
-            cps_cant_reach(self, seg, goal, &mut configs)
-                || [1, 4, 16].iter().any(|tr| {
-                    cps_cant_reach(
-                        &self.make_transcript_macro(*tr),
-                        seg,
-                        goal,
-                        &mut configs,
-                    )
-                })
-                || cps_cant_reach(
-                    &self.make_lru_macro(),
-                    seg,
-                    goal,
-                    &mut configs,
-                )
-        })
+    // Transcript macros in the given order, then the LRU macro. The
+    // same macros are reset and reused at every radius, so escalation
+    // keeps their allocations instead of rebuilding them.
+    fn history_macros(
+        &self,
+        transcripts: &[usize],
+    ) -> Vec<HistoryMacro<'_, s, c>> {
+        transcripts
+            .iter()
+            .map(|&tr| self.make_transcript_macro(tr))
+            .chain(once(self.make_lru_macro()))
+            .collect()
     }
 
     /// State A is an ignorable initial transient exactly when the concrete
@@ -141,20 +239,46 @@ fn cps_cant_reach(
     rad: Radius,
     goal: Goal,
     configs: &mut Configs,
-) -> bool {
+) -> Option<usize> {
     // Level 0 is the legacy abstraction.  A reachable abstract goal is
     // the only outcome that enables the next, strictly finer level.
     for refinement_level in 0..=TAIL_SIG_REFINEMENTS.len() {
         configs.refinement_level = refinement_level;
 
         match cps_cant_reach_obs(prog, rad, goal, &mut NoObs, configs) {
-            CpsOutcome::Proved => return true,
+            CpsOutcome::Proved => return Some(refinement_level),
             CpsOutcome::Counterexample => {},
-            CpsOutcome::Inconclusive => return false,
+            CpsOutcome::Inconclusive => return None,
         }
     }
 
-    false
+    None
+}
+
+// The lower levels are run first, as in the search, so the macro
+// reaches the certified level in the same state.
+fn cps_replay(
+    prog: &impl GetInstr,
+    goal: Goal,
+    cert: &CpsCert,
+) -> bool {
+    let mut configs = Configs::new(goal);
+
+    let mut outcome = CpsOutcome::Inconclusive;
+
+    for refinement_level in 0..=cert.level {
+        configs.refinement_level = refinement_level;
+
+        outcome = cps_cant_reach_obs(
+            prog,
+            cert.seg,
+            goal,
+            &mut NoObs,
+            &mut configs,
+        );
+    }
+
+    outcome == CpsOutcome::Proved
 }
 
 fn cps_cant_quasihalt(
@@ -233,6 +357,10 @@ fn cps_cant_reach_obs(
             continue;
         }
 
+        if !budget::spend(1) {
+            return CpsOutcome::Inconclusive;
+        }
+
         let (state, mut tape) = {
             let config = &configs.by_id[config_id];
             obs.see(config_id, config);
@@ -2340,3 +2468,31 @@ fn test_span() {
     assert_eq!(pool.colors(span.span).as_slice(), &[0, 1]);
     assert_eq!(span.last, 1);
 }
+
+#[test]
+fn test_cert() {
+    let prog = Prog::<2, 2>::from("1RB 1LB  1LA ...");
+
+    assert_eq!(prog.cps_certify(5, Halt), None);
+
+    let prog = Prog::<2, 2>::from("1RB 1LB  1LB 1LA");
+
+    let cert = prog.cps_certify(5, Halt).unwrap();
+
+    assert!(prog.cps_verify(Halt, &cert));
+
+    assert_eq!(CpsCert::read(&cert.to_string()), Some(cert));
+
+    assert!(!prog.cps_verify(Halt, &CpsCert { seg: 1, ..cert }));
+
+    assert_eq!(
+        CpsCert::read("3 16 1"),
+        Some(CpsCert {
+            seg: 3,
+            via: CpsMacro::Transcript(16),
+            level: 1,
+        }),
+    );
+
+    assert_eq!(CpsCert::read("3 lru"), None);
+}
@@ -10,6 +10,10 @@
 //! // The argument is the largest FAR block length to try.
 //! // Higher values include every smaller block length.
 //! let proved = prog.far_cant_halt(16);
+//!
+//! // The same search, returning a witness that `far_verify` can
+//! // recheck without searching again.
+//! let cert = prog.far_certify(16, Goal::Halt);
 //! ```
 //!
 //! Behavior:
@@ -21,11 +25,11 @@
 //! block lengths `1..=block` are tried, subject to the alphabet-size
 //! and hard safety caps.  Per-run budgets are fixed functions of `block_len`.
 
-use core::{cmp::Ordering, hash::Hash};
+use core::{cmp::Ordering, fmt, hash::Hash};
 
 use ahash::{AHashMap as Map, AHashSet as Set};
 
-use crate::{Color, Goal, Instr, Prog, Slot, State};
+use crate::{Color, Goal, Instr, Prog, Slot, State, budget};
 
 // -----------------------------------------------------------------------------
 // Top-level tuning constants
@@ -200,9 +204,7 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
     /// - `true` iff FAR or MITM/WFAR proved the machine cannot halt.
     /// - `false` otherwise.
     pub fn far_cant_halt(&self, block: usize) -> bool {
-        self.far_sweep(block, Goal::Halt)
-            || self.mitm_cant_halt()
-            || self.direct_far_cant_target(Goal::Halt)
+        self.far_certify(block, Goal::Halt).is_some()
     }
 
     /// FAR blank-tape prover.
@@ -216,9 +218,7 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
     /// Lossy summary states still use the exact zero-only DFA reachability relation
     /// to decide whether the surrounding block context may be all zero.
     pub fn far_cant_blank(&self, block: usize) -> bool {
-        self.far_sweep(block, Goal::Blank)
-            || self.mitm_cant_blank()
-            || self.direct_far_cant_target(Goal::Blank)
+        self.far_certify(block, Goal::Blank).is_some()
     }
 
     /// FAR spinout prover.
@@ -226,9 +226,175 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
     /// Returns `true` iff FAR proves that the machine can never enter a
     /// one-sided all-zero same-state drift.
     pub fn far_cant_spinout(&self, block: usize) -> bool {
-        self.far_sweep(block, Goal::Spinout)
-            || self.mitm_cant_spinout()
-            || self.direct_far_cant_target(Goal::Spinout)
+        self.far_certify(block, Goal::Spinout).is_some()
+    }
+
+    /// Run FAR, MITM and direct FAR in turn and return the witness of
+    /// whichever proves the goal unreachable.
+    pub fn far_certify(
+        &self,
+        block: usize,
+        goal: Goal,
+    ) -> Option<FarCert> {
+        self.far_sweep(block, goal)
+            .or_else(|| self.mitm_cant_target(goal))
+            .or_else(|| self.direct_far_cant_target(goal))
+    }
+
+    /// Check a witness from `far_certify` without searching.  A sweep
+    /// witness reruns one block length and summary; MITM and direct
+    /// FAR witnesses only have their closure rechecked.
+    pub fn far_verify(&self, goal: Goal, cert: &FarCert) -> bool {
+        match cert {
+            FarCert::Sweep {
+                block_len,
+                mirrored,
+                summary,
+            } => {
+                (1..=FAR_BLOCK_LEN_HARD_CAP).contains(block_len)
+                    && self.far_decide_summary(
+                        *summary,
+                        far_run_params(*block_len, goal, *mirrored),
+                    )
+            },
+            FarCert::Mitm { left, right } => {
+                let colors = self.far_reached_params().colors;
+
+                let (Some(left), Some(right)) = (
+                    MitmWfa::read(left, colors),
+                    MitmWfa::read(right, colors),
+                ) else {
+                    return false;
+                };
+
+                self.mitm_find_closure_break(goal, &left, &right)
+                    .is_none()
+                    && self
+                        .mitm_check_memory_profiles(goal, &left, &right)
+            },
+            FarCert::Direct {
+                direction,
+                dfa_states,
+                dfa,
+            } => self.direct_far_verify(
+                goal,
+                *direction,
+                *dfa_states,
+                dfa,
+            ),
+        }
+    }
+}
+
+/**************************************/
+
+/// Witness that FAR, MITM or direct FAR proved a goal unreachable.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub enum FarCert {
+    Sweep {
+        block_len: usize,
+        mirrored: bool,
+        summary: usize,
+    },
+    Mitm {
+        left: Vec<Vec<(usize, i32)>>,
+        right: Vec<Vec<(usize, i32)>>,
+    },
+    Direct {
+        direction: u8,
+        dfa_states: usize,
+        dfa: Vec<usize>,
+    },
+}
+
+impl FarCert {
+    pub fn read(cert: &str) -> Option<Self> {
+        let mut fields = cert.split(' ');
+
+        let cert = match fields.next()? {
+            "sweep" => Self::Sweep {
+                block_len: fields.next()?.parse().ok()?,
+                mirrored: match fields.next()? {
+                    "0" => false,
+                    "1" => true,
+                    _ => return None,
+                },
+                summary: fields.next()?.parse().ok()?,
+            },
+            "mitm" => Self::Mitm {
+                left: read_wfa(fields.next()?)?,
+                right: read_wfa(fields.next()?)?,
+            },
+            "direct" => Self::Direct {
+                direction: fields.next()?.parse().ok()?,
+                dfa_states: fields.next()?.parse().ok()?,
+                dfa: fields
+                    .next()?
+                    .split(',')
+                    .map(|to| to.parse().ok())
+                    .collect::<Option<_>>()?,
+            },
+            _ => return None,
+        };
+
+        fields.next().is_none().then_some(cert)
+    }
+}
+
+fn read_wfa(wfa: &str) -> Option<Vec<Vec<(usize, i32)>>> {
+    wfa.split(';')
+        .map(|row| {
+            row.split(',')
+                .map(|edge| {
+                    let (to, weight) = edge.split_once(':')?;
+                    Some((to.parse().ok()?, weight.parse().ok()?))
+                })
+                .collect()
+        })
+        .collect()
+}
+
+fn show_wfa(trans: &[Vec<(usize, i32)>]) -> String {
+    trans
+        .iter()
+        .map(|row| {
+            row.iter()
+                .map(|(to, weight)| format!("{to}:{weight}"))
+                .collect::<Vec<_>>()
+                .join(",")
+        })
+        .collect::<Vec<_>>()
+        .join(";")
+}
+
+impl fmt::Display for FarCert {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        match self {
+            Self::Sweep {
+                block_len,
+                mirrored,
+                summary,
+            } => write!(
+                f,
+                "sweep {block_len} {} {summary}",
+                u8::from(*mirrored)
+            ),
+            Self::Mitm { left, right } => {
+                write!(f, "mitm {} {}", show_wfa(left), show_wfa(right))
+            },
+            Self::Direct {
+                direction,
+                dfa_states,
+                dfa,
+            } => write!(
+                f,
+                "direct {direction} {dfa_states} {}",
+                dfa.iter()
+                    .map(ToString::to_string)
+                    .collect::<Vec<_>>()
+                    .join(",")
+            ),
+        }
     }
 }
 
@@ -1015,6 +1181,23 @@ struct FarRunParams {
     mirrored: bool,
 }
 
+/// Summaries tried by `far_decide_summary`, in order.
+const FAR_SUMMARIES: usize = 10;
+
+const fn far_run_params(
+    block_len: usize,
+    goal: Goal,
+    mirrored: bool,
+) -> FarRunParams {
+    FarRunParams {
+        block_len,
+        max_work: FAR_WORK_PER_LEN * block_len,
+        block_step_limit: FAR_STEP_PER_LEN * block_len,
+        goal,
+        mirrored,
+    }
+}
+
 #[derive(Clone, Copy)]
 struct DirectFarParams {
     goal: Goal,
@@ -1027,6 +1210,27 @@ struct DirectFarParams {
     zero_sink: usize,
 }
 
+const fn direct_far_params(
+    goal: Goal,
+    reached: ReachedParams,
+    dfa_states: usize,
+    direction: u8,
+) -> DirectFarParams {
+    let ctrl_states = reached.states;
+    let nfa_states =
+        ctrl_states * dfa_states + DIRECT_FAR_TARGET_STATES;
+    DirectFarParams {
+        goal,
+        direction,
+        reached,
+        dfa_states,
+        ctrl_states,
+        nfa_states,
+        any_sink: nfa_states - 2,
+        zero_sink: nfa_states - 1,
+    }
+}
+
 #[derive(Clone, Eq, PartialEq, Hash, Debug)]
 struct StepKey {
     w: WordId,
@@ -1117,8 +1321,8 @@ impl<const STATES: usize, const COLORS: usize, S: Summary>
         Ok(self)
     }
 
-    const fn bump(&mut self) -> Result<(), StopReason> {
-        if self.work >= self.max_work {
+    fn bump(&mut self) -> Result<(), StopReason> {
+        if self.work >= self.max_work || !budget::spend(1) {
             return Err(StopReason::WorkLimit);
         }
         self.work += 1;
@@ -1842,7 +2046,7 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
         decider.run().is_ok()
     }
 
-    fn far_sweep(&self, block: usize, goal: Goal) -> bool {
+    fn far_sweep(&self, block: usize, goal: Goal) -> Option<FarCert> {
         let reached = self.far_reached_params();
 
         let cap_by_colors = if reached.colors <= 2 {
@@ -1857,46 +2061,53 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
             block.min(cap_by_colors).min(FAR_BLOCK_LEN_HARD_CAP);
 
         for block_len in 1..=block {
-            let max_work = FAR_WORK_PER_LEN * block_len;
-
-            let block_step_limit = FAR_STEP_PER_LEN * block_len;
-
             for mirrored in [true, false] {
-                if self.far_decide(FarRunParams {
-                    block_len,
-                    max_work,
-                    block_step_limit,
-                    goal,
-                    mirrored,
-                }) {
-                    return true;
+                let params = far_run_params(block_len, goal, mirrored);
+
+                if let Some(summary) =
+                    (0..FAR_SUMMARIES).find(|&summary| {
+                        self.far_decide_summary(summary, params)
+                    })
+                {
+                    return Some(FarCert::Sweep {
+                        block_len,
+                        mirrored,
+                        summary,
+                    });
                 }
             }
         }
 
-        false
+        None
     }
 
-    fn far_decide(&self, params: FarRunParams) -> bool {
-        self.far_decide_with::<Ng1Summary>(params)
-            || self.far_decide_with::<NgSummary<
+    fn far_decide_summary(
+        &self,
+        summary: usize,
+        params: FarRunParams,
+    ) -> bool {
+        match summary {
+            0 => self.far_decide_with::<Ng1Summary>(params),
+            1 => self.far_decide_with::<NgSummary<
                 FAR_NG_TAIL_H_SMALL,
                 FAR_NG_POS_MOD_2,
-            >>(params)
-            || self.far_decide_with::<CpsLruSummary>(params)
-            || self.far_decide_with::<RwlModSummary>(params)
-            || self.far_decide_with::<NgSummary<
+            >>(params),
+            2 => self.far_decide_with::<CpsLruSummary>(params),
+            3 => self.far_decide_with::<RwlModSummary>(params),
+            4 => self.far_decide_with::<NgSummary<
                 FAR_NG_TAIL_H_MED,
                 FAR_NG_POS_MOD_3,
-            >>(params)
-            || self.far_decide_with::<NgSetSummary>(params)
-            || self.far_decide_with::<LruPairSummary>(params)
-            || self.far_decide_with::<SetPairSummary>(params)
-            || self.far_decide_with::<RngsModSummary>(params)
-            || self.far_decide_with::<RsModSummary>(params)
+            >>(params),
+            5 => self.far_decide_with::<NgSetSummary>(params),
+            6 => self.far_decide_with::<LruPairSummary>(params),
+            7 => self.far_decide_with::<SetPairSummary>(params),
+            8 => self.far_decide_with::<RngsModSummary>(params),
+            9 => self.far_decide_with::<RsModSummary>(params),
+            _ => false,
+        }
     }
 
-    fn direct_far_cant_target(&self, goal: Goal) -> bool {
+    fn direct_far_cant_target(&self, goal: Goal) -> Option<FarCert> {
         let reached = self.far_reached_params();
         let ctrl_states = reached.states;
 
@@ -1910,22 +2121,23 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
             .min(max_by_entries);
 
         if max_dfa_states == 0 {
-            return false;
+            return None;
         }
 
         let mut fuel = DIRECT_FAR_MAX_WORK;
         for dfa_states in 1..=max_dfa_states {
-            if self.direct_far_decide_exact(
+            let cert = self.direct_far_decide_exact(
                 goal, reached, dfa_states, &mut fuel,
-            ) {
-                return true;
+            );
+            if cert.is_some() {
+                return cert;
             }
             if fuel == 0 {
                 break;
             }
         }
 
-        false
+        None
     }
 
     fn direct_far_decide_exact(
@@ -1934,18 +2146,54 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
         reached: ReachedParams,
         dfa_states: usize,
         fuel: &mut usize,
-    ) -> bool {
+    ) -> Option<FarCert> {
         let ctrl_states = reached.states;
         debug_assert!(
             ctrl_states * dfa_states + DIRECT_FAR_TARGET_STATES
                 <= DIRECT_FAR_MAX_NFA_STATES
         );
 
-        self.direct_far_decide_direction(
-            goal, reached, dfa_states, 0, fuel,
-        ) || self.direct_far_decide_direction(
-            goal, reached, dfa_states, 1, fuel,
-        )
+        [0, 1].into_iter().find_map(|direction| {
+            self.direct_far_decide_direction(
+                goal, reached, dfa_states, direction, fuel,
+            )
+            .map(|dfa| FarCert::Direct {
+                direction,
+                dfa_states,
+                dfa,
+            })
+        })
+    }
+
+    fn direct_far_verify(
+        &self,
+        goal: Goal,
+        direction: u8,
+        dfa_states: usize,
+        dfa: &[usize],
+    ) -> bool {
+        let reached = self.far_reached_params();
+
+        if direction > 1
+            || dfa_states == 0
+            || DIRECT_FAR_MAX_NFA_STATES
+                < reached.states * dfa_states + DIRECT_FAR_TARGET_STATES
+            || dfa.len() != reached.colors * dfa_states
+            || dfa.iter().any(|&to| dfa_states <= to)
+        {
+            return false;
+        }
+
+        let params =
+            direct_far_params(goal, reached, dfa_states, direction);
+
+        let (mut r, mut a) = self.direct_far_start(params);
+
+        (0..dfa.len()).all(|entry| {
+            self.direct_far_extend_nfa(
+                params, dfa, &mut r, &mut a, entry,
+            )
+        })
     }
 
     fn direct_far_decide_direction(
@@ -1955,34 +2203,35 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
         dfa_states: usize,
         direction: u8,
         fuel: &mut usize,
-    ) -> bool {
-        if *fuel == 0 {
-            return false;
+    ) -> Option<Vec<usize>> {
+        if *fuel == 0 || !budget::spend(1) {
+            *fuel = 0;
+            return None;
         }
 
-        let ctrl_states = reached.states;
-        let nfa_states =
-            ctrl_states * dfa_states + DIRECT_FAR_TARGET_STATES;
-        let any_sink = nfa_states - 2;
-        let zero_sink = nfa_states - 1;
-        let params = DirectFarParams {
-            goal,
-            direction,
-            reached,
-            dfa_states,
-            ctrl_states,
-            nfa_states,
-            any_sink,
-            zero_sink,
-        };
+        let params =
+            direct_far_params(goal, reached, dfa_states, direction);
 
-        let mut r = vec![vec![0_u128; nfa_states]; reached.colors];
-        let a = direct_far_bit(any_sink) | direct_far_bit(zero_sink);
-        self.direct_far_init_targets(params, &mut r);
+        let (r, a) = self.direct_far_start(params);
 
         let dfa_entries = reached.colors * dfa_states;
         let mut dfa = vec![0_usize; dfa_entries];
         self.direct_far_search(params, &mut dfa, 0, 0, &r, a, fuel)
+            .then_some(dfa)
+    }
+
+    fn direct_far_start(
+        &self,
+        params: DirectFarParams,
+    ) -> (Vec<Vec<u128>>, u128) {
+        let mut r = vec![
+            vec![0_u128; params.nfa_states];
+            params.reached.colors
+        ];
+        let a = direct_far_bit(params.any_sink)
+            | direct_far_bit(params.zero_sink);
+        self.direct_far_init_targets(params, &mut r);
+        (r, a)
     }
 
     fn direct_far_init_targets(
@@ -2125,7 +2374,8 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
         };
 
         for to_state in 0..=max_to_state {
-            if *fuel == 0 {
+            if *fuel == 0 || !budget::spend(1) {
+                *fuel = 0;
                 return false;
             }
             *fuel -= 1;
@@ -2282,36 +2532,24 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
         (r[0][start_idx] & *a) == 0
     }
 
-    fn mitm_cant_halt(&self) -> bool {
-        self.mitm_cant_target(Goal::Halt)
-    }
-
-    fn mitm_cant_blank(&self) -> bool {
-        self.mitm_cant_target(Goal::Blank)
-    }
-
-    fn mitm_cant_spinout(&self) -> bool {
-        self.mitm_cant_target(Goal::Spinout)
-    }
-
-    fn mitm_cant_target(&self, goal: Goal) -> bool {
+    fn mitm_cant_target(&self, goal: Goal) -> Option<FarCert> {
         let colors = self.far_reached_params().colors;
 
         // Enumerate every closed MITM-DFA skeleton once.  At each closed
         // skeleton, enumerate its weight assignments once and test the full
         // asymmetric finite-memory portfolio against each candidate.
-        for dfa_transitions in 2..=MITM_MAX_TRANSITIONS {
-            if self.mitm_decide_exact(
+        (2..=MITM_MAX_TRANSITIONS).find_map(|dfa_transitions| {
+            self.mitm_decide_exact(
                 goal,
                 dfa_transitions,
                 MITM_MAX_WEIGHT_PAIRS,
                 colors,
-            ) {
-                return true;
-            }
-        }
-
-        false
+            )
+            .map(|(left, right)| FarCert::Mitm {
+                left: left.trans,
+                right: right.trans,
+            })
+        })
     }
 
     fn mitm_decide_exact(
@@ -2320,12 +2558,13 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
         dfa_transitions: usize,
         max_weight_pairs: usize,
         colors: usize,
-    ) -> bool {
+    ) -> Option<(MitmWfa, MitmWfa)> {
         let mut left = MitmWfa::new(colors);
         let mut right = MitmWfa::new(colors);
         left.trans[0][0] = (0, 0);
         right.trans[0][0] = (0, 0);
 
+        // On success the recursion leaves the witness in place.
         self.mitm_recurse_dfa(
             goal,
             &mut left,
@@ -2336,6 +2575,7 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
                 max_weight_pairs,
             },
         )
+        .then_some((left, right))
     }
 
     fn mitm_recurse_dfa(
@@ -2346,6 +2586,10 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
         current_transitions: usize,
         params: MitmSearchParams,
     ) -> bool {
+        if !budget::spend(1) {
+            return false;
+        }
+
         match self.mitm_find_closure_break(goal, left, right) {
             None => {
                 current_transitions == params.goal_transitions
@@ -2374,8 +2618,6 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
                         current_transitions + 1,
                         params,
                     ) {
-                        left.trans[state][color] = old;
-                        left.pop_state();
                         return true;
                     }
                     left.trans[state][color] = old;
@@ -2396,7 +2638,6 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
                         current_transitions + 1,
                         params,
                     ) {
-                        left.trans[state][color] = old;
                         return true;
                     }
                     left.trans[state][color] = old;
@@ -2420,8 +2661,6 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
                         current_transitions + 1,
                         params,
                     ) {
-                        right.trans[state][color] = old;
-                        right.pop_state();
                         return true;
                     }
                     right.trans[state][color] = old;
@@ -2442,7 +2681,6 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
                         current_transitions + 1,
                         params,
                     ) {
-                        right.trans[state][color] = old;
                         return true;
                     }
                     right.trans[state][color] = old;
@@ -2597,6 +2835,10 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
         current_weight_pairs: usize,
         max_weight_pairs: usize,
     ) -> bool {
+        if !budget::spend(1) {
+            return false;
+        }
+
         if self.mitm_check_memory_profiles(goal, left, right) {
             return true;
         }
@@ -2627,8 +2869,6 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
                         current_weight_pairs + 1,
                         max_weight_pairs,
                     ) {
-                        right.trans[rs][rc] = (rt, old_rw);
-                        left.trans[ls][lc] = (lt, old_lw);
                         return true;
                     }
                     right.trans[rs][rc] = (rt, old_rw);
@@ -2859,7 +3099,7 @@ impl<const STATES: usize, const COLORS: usize> Prog<STATES, COLORS> {
 }
 
 // -----------------------------------------------------------------------------
-// MITMWFAR boolean-only decider
+// MITMWFAR decider
 // -----------------------------------------------------------------------------
 
 /**************************************/
@@ -3056,6 +3296,24 @@ fn mitm_blank_transition_possible(next: &MitmNextBounds) -> bool {
 }
 
 impl MitmWfa {
+    fn read(
+        trans: &[Vec<(usize, i32)>],
+        colors: usize,
+    ) -> Option<Self> {
+        let states = trans.len();
+
+        (2 <= states
+            && trans.iter().all(|row| {
+                row.len() == colors
+                    && row.iter().all(|&(to, _)| to < states)
+            }))
+        .then(|| Self {
+            states,
+            colors,
+            trans: trans.to_vec(),
+        })
+    }
+
     fn new(colors: usize) -> Self {
         Self {
             states: 2,
@@ -4,12 +4,14 @@
 
 pub mod bkw;
 pub mod blocks;
+pub mod budget;
 pub mod config;
 pub mod cps;
 pub mod far;
 pub mod instrs;
 pub mod machine;
 pub mod macros;
+pub mod pipeline;
 pub mod prog;
 pub mod prover;
 pub mod rules;
@@ -590,6 +590,7 @@ pub struct HistoryMacro<'p, const s: usize, const c: usize> {
     instrs: RefCell<Dict<Slot, Instr>>,
 
     colors: RefCell<Vec<(Color, History)>>,
+    index: RefCell<Dict<(Color, History), Color>>,
 
     updater: Box<dyn Fn(Slot, &History) -> History>,
 }
@@ -649,14 +650,23 @@ impl<'p, const s: usize, const c: usize> HistoryMacro<'p, s, c> {
     ) -> Self {
         let colors = vec![(0, vec![])];
 
+        let index = Dict::from([((0, vec![]), 0)]);
+
         Self {
             prog,
             instrs: Dict::new().into(),
             colors: colors.into(),
+            index: index.into(),
             updater: Box::new(updater),
         }
     }
 
+    pub fn reset(&self) {
+        self.instrs.borrow_mut().clear();
+        self.colors.borrow_mut().truncate(1);
+        self.index.borrow_mut().retain(|_, &mut color| color == 0);
+    }
+
     fn encode(
         &self,
         print: Color,
@@ -664,19 +674,20 @@ impl<'p, const s: usize, const c: usize> HistoryMacro<'p, s, c> {
     ) -> Result<Color, MacroExc> {
         let new = (print, history);
 
+        if let Some(&color) = self.index.borrow().get(&new) {
+            return Ok(color);
+        }
+
         let mut colors = self.colors.borrow_mut();
 
-        let index = if let Some((index, _)) =
-            colors.iter().enumerate().find(|&(_, entry)| *entry == new)
-        {
-            index
-        } else {
-            let index = colors.len();
-            colors.push(new);
-            index
-        };
+        let color = Color::try_from(colors.len())
+            .map_err(MacroExc::Conversion)?;
+
+        colors.push(new.clone());
+
+        self.index.borrow_mut().insert(new, color);
 
-        Color::try_from(index).map_err(MacroExc::Conversion)
+        Ok(color)
     }
 }
 
@@ -706,3 +717,29 @@ fn update_transcript(
         history
     }
 }
+
+/**************************************/
+
+#[test]
+fn test_history_reset() {
+    let prog = Prog::<2, 2>::from("1RB 1LB  1LA 0LB");
+
+    let lru = prog.make_lru_macro();
+
+    let walk = |slots: &[Slot]| {
+        slots
+            .iter()
+            .map(|slot| lru.get_instr(slot))
+            .collect::<Vec<_>>()
+    };
+
+    let fresh = walk(&[(0, 0), (1, 1), (1, 0), (0, 2), (1, 2)]);
+
+    lru.reset();
+
+    assert_eq!(walk(&[(1, 0)]), [Ok(Some((1, false, 0)))]);
+
+    lru.reset();
+
+    assert_eq!(fresh, walk(&[(0, 0), (1, 1), (1, 0), (0, 2), (1, 2)]));
+}
@@ -0,0 +1,167 @@
+use core::fmt;
+use std::time::{Duration, Instant};
+
+use crate::{Goal, Prog, Steps, config::MedConfig, cps::Radius};
+
+use Goal::*;
+
+/**************************************/
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum Stage {
+    Slots,
+    Lin(Steps),
+    Bkw(Steps),
+    Prover(Steps),
+    Cps(Radius),
+    Far(usize),
+}
+
+use Stage::*;
+
+impl Stage {
+    pub fn read(name: &str, budget: usize) -> Option<Self> {
+        Some(match name {
+            "slots" => Slots,
+            "lin" => Lin(budget),
+            "bkw" => Bkw(budget),
+            "prover" => Prover(budget),
+            "cps" => Cps(budget),
+            "far" => Far(budget),
+            _ => return None,
+        })
+    }
+
+    fn settles<const s: usize, const c: usize>(
+        self,
+        prog: &Prog<s, c>,
+        goal: Goal,
+        config: &mut MedConfig,
+    ) -> bool {
+        match self {
+            Slots => match goal {
+                Halt => prog.halt_slots().is_empty(),
+                Blank => prog.erase_slots().is_empty(),
+                Spinout => prog.zr_shifts().is_empty(),
+            },
+            Lin(steps) => prog.term_or_rec(steps, config).is_settled(),
+            Bkw(steps) => match goal {
+                Halt => prog.bkw_cant_halt(steps),
+                Blank => prog.bkw_cant_blank(steps),
+                Spinout => prog.bkw_cant_spinout(steps),
+            }
+            .is_refuted(),
+            Prover(steps) => prog.prover_settled(steps),
+            Cps(rad) => match goal {
+                Halt => prog.cps_cant_halt(rad),
+                Blank => prog.cps_cant_blank(rad),
+                Spinout => prog.cps_cant_spinout(rad),
+            },
+            Far(block) => match goal {
+                Halt => prog.far_cant_halt(block),
+                Blank => prog.far_cant_blank(block),
+                Spinout => prog.far_cant_spinout(block),
+            },
+        }
+    }
+}
+
+impl fmt::Display for Stage {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        match self {
+            Slots => write!(f, "slots"),
+            Lin(steps) => write!(f, "lin({steps})"),
+            Bkw(steps) => write!(f, "bkw({steps})"),
+            Prover(steps) => write!(f, "prover({steps})"),
+            Cps(rad) => write!(f, "cps({rad})"),
+            Far(block) => write!(f, "far({block})"),
+        }
+    }
+}
+
+/**************************************/
+
+pub struct Verdict {
+    pub settled: Option<usize>,
+    pub elapsed: Vec<Duration>,
+}
+
+#[derive(Clone)]
+pub struct Pipeline {
+    pub goal: Goal,
+    pub stages: Vec<Stage>,
+}
+
+impl Pipeline {
+    pub const fn new(goal: Goal, stages: Vec<Stage>) -> Self {
+        Self { goal, stages }
+    }
+
+    pub fn standard(goal: Goal) -> Self {
+        Self::new(
+            goal,
+            vec![
+                Slots,
+                Lin(4_000),
+                Bkw(50),
+                Lin(10_000),
+                Prover(1_000),
+                Cps(20),
+                Lin(5_000_000),
+                Prover(100_000),
+                Far(4),
+            ],
+        )
+    }
+
+    pub fn run<const s: usize, const c: usize>(
+        &self,
+        prog: &Prog<s, c>,
+    ) -> Verdict {
+        self.run_from(prog, &mut MedConfig::init_stepped())
+    }
+
+    pub fn run_from<const s: usize, const c: usize>(
+        &self,
+        prog: &Prog<s, c>,
+        config: &mut MedConfig,
+    ) -> Verdict {
+        let mut elapsed = vec![];
+
+        let settled = self.stages.iter().position(|stage| {
+            let start = Instant::now();
+
+            let settles = stage.settles(prog, self.goal, config);
+
+            elapsed.push(start.elapsed());
+
+            settles
+        });
+
+        Verdict { settled, elapsed }
+    }
+}
+
+/**************************************/
+
+#[test]
+fn test_pipeline() {
+    let pipeline = Pipeline::standard(Halt);
+
+    let verdict = pipeline.run(&Prog::<2, 2>::from("1RB 1LB  1LA 1RA"));
+
+    assert_eq!(verdict.settled, Some(0));
+    assert_eq!(verdict.elapsed.len(), 1);
+
+    let verdict = pipeline.run(&Prog::<2, 2>::from("1RB 1LB  1LA ..."));
+
+    let stage = verdict.settled.unwrap();
+
+    assert_eq!(pipeline.stages[stage], Lin(4_000));
+    assert_eq!(verdict.elapsed.len(), 1 + stage);
+
+    assert_eq!(Stage::read("cps", 20), Some(Cps(20)));
+    assert_eq!(Stage::read("pcs", 20), None);
+
+    assert_eq!(Far(4).to_string(), "far(4)");
+}
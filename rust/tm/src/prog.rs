@@ -6,6 +6,7 @@ use crate::{Color, Instr, Shift, Slot, State, instrs::Parse};
 
 /**************************************/
 
+#[derive(Clone, PartialEq, Eq, Hash)]
 pub struct Prog<const states: usize, const colors: usize> {
     table: [[Option<Instr>; colors]; states],
 }
@@ -1,6 +1,33 @@
+import json
+from operator import itemgetter
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest.mock import patch
 
 from tm.machine import Machine
+from tm.macro import (
+    CompiledMacroProg,
+    FlatMacroProg,
+    LruCache,
+    MacroInfLoop,
+    MacroProg,
+    PackedConverter,
+    TapeColorConverter,
+    block_ranks,
+    macro_cache_key,
+    macro_cache_path,
+    make_backsymbol_macro,
+    make_block,
+    make_block_macro,
+    make_converter,
+    make_macro,
+    opt_block,
+    prog_params,
+    save_macros,
+)
+from tm.portfolio import portfolio_configs, run_config, run_portfolio
+from tm.prover import SigStats
 from tools.instr_seq import instr_seq
 
 
@@ -93,6 +120,260 @@ class TestFloss(TestCase):
                 lru_history = True,
             ).run().spnout)
 
+    def test_flat_macro(self):
+        for prog, blocks in (
+                ("1RB 0RA 1LB  2LA 2RB 0LA", 3),
+                ("1RB 1RC 0RC  1RC 0LA 1LB  2LC 2RA 1LB", 4),
+                ("1RB 2LA 1RA 1RA  1LB 1LA 3RB ...", 2),
+        ):
+            flat = Machine(prog, blocks = blocks, backsym = 1)
+
+            assert isinstance(flat.program, FlatMacroProg)
+
+            stacked = Machine(prog)
+
+            comp = make_macro(prog)
+
+            block = make_block_macro(
+                comp,
+                blocks,
+                prog_params(comp))
+
+            stacked.program = make_backsymbol_macro(
+                block, 1, prog_params(block))
+
+            _ = flat.run(10_000)
+            _ = stacked.run(10_000)
+
+            self.assertEqual(flat.steps, stacked.steps)
+            self.assertEqual(flat.marks, stacked.marks)
+            self.assertEqual(flat.infrul, stacked.infrul)
+            self.assertEqual(flat.undfnd, stacked.undfnd)
+
+            self.assertEqual(
+                str(flat.program),
+                str(stacked.program))
+
+    def test_converter(self):
+        converter = TapeColorConverter(3, 4)
+
+        self.assertEqual(
+            converter.color_to_tape(46),
+            (1, 2, 0, 1))
+
+        self.assertEqual(
+            TapeColorConverter(3, 4).tape_to_color((1, 2, 0, 1)),
+            46)
+
+        packed = make_converter(4, 3)
+
+        self.assertIsInstance(packed, PackedConverter)
+
+        self.assertEqual(
+            packed.color_to_tape(27),
+            (1, 2, 3))
+
+        self.assertEqual(
+            packed.tape_to_color((1, 2, 3)),
+            27)
+
+        self.assertNotIsInstance(
+            make_converter(3, 3),
+            PackedConverter)
+
+    def test_block_loop(self):
+        macro = MacroProg(
+            make_macro("0RB ...  0LA ..."),
+            make_block(41, (2, 2)))
+
+        with self.assertRaises(MacroInfLoop):
+            macro.run_simulator((0, (False, (0,) * 41)))
+
+    def test_macro_cache(self):
+        prog = "1RB 1RC 0RC  1RC 0LA 1LB  2LC 2RA 1LB"
+
+        with TemporaryDirectory() as cache:
+            cache_dir = Path(cache)
+
+            cold = Machine(
+                prog,
+                blocks = 4,
+                backsym = 1,
+                cache_dir = cache_dir,
+            ).run()
+
+            self.assertEqual(len(list(cache_dir.iterdir())), 0)
+
+            save_macros(cold.program)
+
+            assert isinstance(cold_macro := cold.program, FlatMacroProg)
+
+            self.assertEqual(len(list(cache_dir.iterdir())), 2)
+
+            warm = Machine(
+                prog,
+                blocks = 4,
+                backsym = 1,
+                cache_dir = cache_dir,
+            )
+
+            assert isinstance(macro := warm.program, FlatMacroProg)
+
+            with (
+                patch.object(macro, 'calculate_instr') as outer,
+                patch.object(macro.inner, 'calculate_instr') as inner,
+            ):
+                _ = warm.run()
+
+            outer.assert_not_called()
+            inner.assert_not_called()
+
+            self.assertEqual(cold.steps, warm.steps)
+            self.assertEqual(cold.marks, warm.marks)
+
+            self.assertEqual(
+                macro.instrs,
+                cold_macro.instrs)
+
+            inner_path = macro_cache_path(cold_macro.inner, cache_dir)
+
+            assert inner_path is not None
+
+            swap = {1: 2, 2: 1}
+
+            cached = json.loads(inner_path.read_text())
+
+            colors = cached['colors']
+
+            colors[1], colors[2] = colors[2], colors[1]
+
+            cached['instrs'] = [
+                [state, swap.get(color, color),
+                 swap.get(pr, pr), sh, tr]
+                for state, color, pr, sh, tr in cached['instrs']
+            ]
+
+            inner_path.write_text(json.dumps(cached))
+
+            shuffled = Machine(
+                prog,
+                blocks = 4,
+                backsym = 1,
+                cache_dir = cache_dir,
+            )
+
+            assert isinstance(macro := shuffled.program, FlatMacroProg)
+
+            with patch.object(
+                    macro,
+                    'calculate_instr',
+                    wraps = macro.calculate_instr,
+            ) as outer:
+                _ = shuffled.run()
+
+            outer.assert_called()
+
+            self.assertEqual(cold.steps, shuffled.steps)
+            self.assertEqual(cold.marks, shuffled.marks)
+
+            wide = Machine(
+                prog,
+                blocks = 4,
+                backsym = 1,
+                params = (3, 4),
+            )
+
+            self.assertNotEqual(
+                macro_cache_key(macro),
+                macro_cache_key(wide.program))
+
+    def test_bounded_macro(self):
+        prog = "1RB 1RC 0RC  1RC 0LA 1LB  2LC 2RA 1LB"
+
+        plain = Machine(prog, blocks = 5, backsym = 1).run()
+
+        bounded = Machine(
+            prog,
+            blocks = 5,
+            backsym = 1,
+            cache_limit = 4,
+        ).run()
+
+        self.assertEqual(plain.steps, bounded.steps)
+        self.assertEqual(plain.marks, bounded.marks)
+
+        self.assertIn('CACHES', str(bounded))
+        self.assertNotIn('CACHES', str(plain))
+
+        assert isinstance(macro := bounded.program, MacroProg)
+
+        assert isinstance(instrs := macro.instrs, LruCache)
+
+        self.assertLessEqual(len(instrs), 4)
+        self.assertGreater(instrs.evictions, 0)
+
+    def test_eager_macro(self):
+        for prog, blocks in (
+                ("1RB 2LA 1RA 1RA  1LB 1LA 3RB ...", 2),
+                ("1RB 1RC 0RC  1RC 0LA 1LB  2LC 2RA 1LB", 4),
+                ("1RB 0LC  0RD 1RA  ... 0LD  1LE 1LA  0LF 1LA  0RE 1LF", 3),
+        ):
+            lazy = Machine(prog, blocks = blocks).run(10_000)
+            eager = Machine(prog, blocks = blocks, eager = True).run(10_000)
+
+            assert isinstance(eager.program, CompiledMacroProg)
+
+            self.assertEqual(lazy.steps, eager.steps)
+            self.assertEqual(lazy.marks, eager.marks)
+
+            self.assertEqual(
+                str(lazy.program),
+                str(eager.program))
+
+        self.assertNotIsInstance(
+            Machine(
+                "1RB 2LA 1RA 1RA  1LB 1LA 3RB ...",
+                blocks = 20,
+                eager = True,
+            ).program,
+            CompiledMacroProg)
+
+    def test_portfolio(self):
+        prog = "1RB 1LB  1LA 0LC  ... 1LD  1RD 0RA"
+
+        configs = portfolio_configs(prog, 1_000)
+
+        ranks = block_ranks(prog, 1_000)
+
+        self.assertEqual(ranks[0][0], opt_block(prog, 1_000))
+        self.assertEqual(
+            sorted(ranks, key = itemgetter(1)),
+            list(ranks))
+
+        self.assertGreater(block_ranks.cache_info().hits, 0)
+
+        self.assertIn((None, None), configs)
+        self.assertIn((None, 1), configs)
+        self.assertEqual(len(configs), len(set(configs)))
+
+        for config in configs:
+            outcome = run_config(prog, 10_000, config)
+
+            print(outcome)
+
+            self.assertTrue(outcome.decisive)
+            self.assertEqual(outcome.cat, 'undfnd')
+
+        result = run_portfolio(prog)
+
+        assert result is not None
+
+        self.assertEqual(result.cat, 'undfnd')
+        self.assertIn((result.blocks, result.backsym), configs)
+
+        self.assertIsNone(
+            run_portfolio(prog, sim_lim = 3, workers = 2))
+
     def test_machine(self):
         self.assertIsNotNone(
             Machine(
@@ -160,6 +441,39 @@ class TestFloss(TestCase):
         error = "1RB 2RA 1LB 0RC  2LA 3LB 1LA ...  ... 1RB ... 2RC"
         print(Machine(error).run())
 
+    def test_prover_stats(self):
+        machine = Machine(
+            "1RB 0LC  1LC 1RA  1LD 0LD  0LE 0LC  1RE 0RB",
+            opt_macro = 500,
+        ).run(backoff = True)
+
+        print(machine.prover.show_stats())
+
+        self.assertTrue(
+            machine.prover.stats)
+
+        stats = SigStats()
+
+        for _ in range(5):
+            self.assertFalse(
+                stats.backing_off(stable = False))
+
+            stats.record(proved = False, elapsed = 0.0)
+
+        self.assertTrue(
+            stats.backing_off(stable = False))
+
+        self.assertFalse(
+            stats.backing_off(stable = True))
+
+        stats.record(proved = True, elapsed = 0.0)
+
+        self.assertEqual(stats.backoff, 0)
+
+        self.assertEqual(
+            str(stats),
+            "ATTEMPTS: 6 | FAILURES: 5 | ELAPSED: 0.000000")
+
     def test_instr_seq(self):
         progs = (
             "1RB 1LB  1LA ...",
@@ -1,23 +1,45 @@
 # ruff:file-ignore[undefined-local-with-import-star-usage]
 import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import TYPE_CHECKING
 from unittest import TestCase
 
 from test.prog_data import *  # ruff:ignore[undefined-local-with-import-star]
 from tm.rust_stuff import (
+    Budget,
+    CancelToken,
+    Outcome,
+    Pipeline,
+    Prog,
     bkw_cant_blank,
     bkw_cant_halt,
+    bkw_cant_halt_batch,
+    bkw_cant_halt_budget,
     bkw_cant_spinout,
     bkw_cant_twostep,
     bkw_cant_zloop,
     cps_cant_blank,
     cps_cant_halt,
+    cps_cant_halt_batch,
+    cps_cant_halt_budget,
+    cps_cant_halt_budget_batch,
     cps_cant_quasihalt,
     cps_cant_spinout,
+    cps_certify,
+    cps_verify,
+    cps_verify_batch,
     far_cant_blank,
     far_cant_halt,
+    far_cant_halt_batch,
+    far_cant_halt_budget,
     far_cant_spinout,
+    far_certify,
+    far_verify,
+    far_verify_batch,
+    tcompile,
 )
+from tools.decider_cache import DeciderCache, canonical
 from tools.graph import Graph as GraphPy
 
 if TYPE_CHECKING:
@@ -433,3 +455,228 @@ class Far(DeciderTest):
                 new_solved = True
 
         self.assertFalse(new_solved)
+
+########################################
+
+class Batch(TestCase):
+    def test_batch(self):
+        progs = sorted(HALTERS | NONHALTERS)
+
+        self.assertEqual(
+            cps_cant_halt_batch(progs, 7),
+            [cps_cant_halt(prog, 7) for prog in progs])
+
+        self.assertEqual(
+            far_cant_halt_batch(progs, 3),
+            [far_cant_halt(prog, 3) for prog in progs])
+
+        self.assertEqual(
+            [str(res) for res in bkw_cant_halt_batch(progs, 100)],
+            [str(bkw_cant_halt(prog, 100)) for prog in progs])
+
+        self.assertEqual(cps_cant_halt_batch([], 7), [])
+
+    def test_threads(self):
+        progs = sorted(HALTERS | NONHALTERS)
+
+        with ThreadPoolExecutor() as pool:
+            self.assertEqual(
+                list(pool.map(far_cant_halt, progs, repeat(3))),
+                [far_cant_halt(prog, 3) for prog in progs])
+
+    def test_prog(self):
+        for prog in sorted(HALTERS | NONHALTERS):
+            parsed = Prog(prog)
+
+            self.assertEqual(parsed, Prog(str(parsed)))
+            self.assertEqual(hash(parsed), hash(Prog(prog)))
+            self.assertEqual(parsed.tcompile(), tcompile(prog))
+
+            self.assertEqual(
+                parsed.cps_cant_halt(7),
+                cps_cant_halt(prog, 7))
+
+            self.assertEqual(
+                parsed.far_cant_halt(3),
+                far_cant_halt(prog, 3))
+
+            self.assertEqual(
+                str(parsed.bkw_cant_halt(100)),
+                str(bkw_cant_halt(prog, 100)))
+
+        self.assertNotEqual(
+            Prog("1RB 1LB  1LA ..."),
+            Prog("1RB 1LB  1LA 1RB"))
+
+        self.assertEqual(
+            Prog("1RB 1LB  ... 1LA").halt_slots(),
+            {(1, 0)})
+
+    def test_pipeline(self):
+        self.assertEqual(Pipeline('halt').stages()[0], 'slots')
+
+        pipeline = Pipeline(
+            'halt',
+            [('slots', 0), ('lin', 1_000), ('bkw', 50), ('cps', 7)])
+
+        stages = pipeline.stages()
+
+        for prog in sorted(HALTERS):
+            verdict = pipeline(prog)
+
+            self.assertEqual(
+                verdict.stage,
+                pipeline.run(Prog(prog)).stage)
+
+            if not verdict.is_settled():
+                self.assertEqual(len(verdict.timings), len(stages))
+                continue
+
+            self.assertNotIn(verdict.stage, {'slots', 'bkw(50)', 'cps(7)'})
+
+            self.assertEqual(
+                verdict.timings[-1][0],
+                verdict.stage)
+
+        custom = Pipeline('spinout', [('cps', 5), ('far', 2)])
+
+        self.assertEqual(custom.stages(), ['cps(5)', 'far(2)'])
+
+        with self.assertRaises(ValueError):
+            Pipeline('loop')
+
+        with self.assertRaises(ValueError):
+            Pipeline('halt', [('sat', 1)])
+
+    def test_budget(self):
+        progs = sorted(HALTERS | NONHALTERS)
+
+        unlimited = Budget()
+
+        for prog in progs:
+            self.assertEqual(
+                cps_cant_halt_budget(prog, 7, unlimited).is_settled(),
+                cps_cant_halt(prog, 7))
+
+            self.assertEqual(
+                far_cant_halt_budget(prog, 3, unlimited).is_settled(),
+                far_cant_halt(prog, 3))
+
+            self.assertEqual(
+                bkw_cant_halt_budget(prog, 100, unlimited).is_settled(),
+                bkw_cant_halt(prog, 100).is_refuted())
+
+        capped = Budget(work = 1)
+
+        for report in cps_cant_halt_budget_batch(progs, 7, capped):
+            self.assertLessEqual(report.work, 1)
+
+        token = CancelToken()
+        token.cancel()
+
+        self.assertTrue(token.is_cancelled())
+
+        cancelled = Budget(cancel = token)
+
+        self.assertTrue(all(
+            report.outcome == Outcome.exhausted
+            for report in cps_cant_halt_budget_batch(
+                sorted(HALTERS), CPS_LIMIT, cancelled)
+            if not report.is_settled()))
+
+        with self.assertRaises(ValueError):
+            Budget(timeout = -1.0)
+
+    def test_cache(self):
+        self.assertEqual(
+            canonical("1RC 1LB  1LA 1RC  1LB ..."),
+            canonical("1RB 1LC  1LC ...  1LA 1RB"))
+
+        self.assertEqual(
+            canonical("1LB 1RB  1RA ..."),
+            canonical("1RB 1LB  1LA ..."))
+
+        progs = sorted(HALTERS | NONHALTERS)
+
+        with DeciderCache() as cache:
+            self.assertEqual(
+                cache.decide_batch('cps', 'halt', progs, 7),
+                cps_cant_halt_batch(
+                    [canonical(prog) for prog in progs], 7))
+
+            proved = cache.decide_batch('cps', 'halt', progs, 7)
+
+            escalated = cache.decide_batch('cps', 'halt', progs, 9)
+
+            for prog, low, high in zip(
+                    progs, proved, escalated, strict = True):
+                if low:
+                    self.assertTrue(high)
+                    continue
+
+                self.assertEqual(
+                    high,
+                    cps_cant_halt(canonical(prog), 9))
+
+                self.assertFalse(
+                    cache.decide('cps', 'halt', prog, 5))
+
+    def test_certify(self):
+        progs = sorted(HALTERS | NONHALTERS)
+
+        cps_certs = {
+            prog: cert
+            for prog in progs
+            if (cert := cps_certify(prog, 'halt', 7)) is not None
+        }
+
+        far_certs = {
+            prog: cert
+            for prog in progs
+            if (cert := far_certify(prog, 'halt', 3)) is not None
+        }
+
+        self.assertEqual(
+            set(cps_certs),
+            {prog for prog in progs if cps_cant_halt(prog, 7)})
+
+        self.assertEqual(
+            set(far_certs),
+            {prog for prog in progs if far_cant_halt(prog, 3)})
+
+        self.assertTrue(all(
+            cps_verify_batch(list(cps_certs.items()), 'halt')))
+
+        self.assertTrue(all(
+            far_verify_batch(list(far_certs.items()), 'halt')))
+
+        for prog, cert in far_certs.items():
+            self.assertTrue(
+                far_verify(prog, 'halt', cert))
+
+        for prog in sorted(HALTERS)[:20]:
+            for cert in set(cps_certs.values()):
+                self.assertFalse(cps_verify(prog, 'halt', cert))
+
+            for cert in list(far_certs.values())[:20]:
+                self.assertFalse(far_verify(prog, 'halt', cert))
+
+        with self.assertRaises(ValueError):
+            far_verify("1RB 1LB  1LA ...", 'halt', 'sweep 1')
+
+        with self.assertRaises(ValueError):
+            cps_verify("1RB 1LB  1LA ...", 'halt', '5 base')
+
+        self.assertEqual(
+            cps_certify("1RB 1LB  1LB 1LA", 'halt', 7),
+            'slots')
+
+        self.assertEqual(
+            far_certify("1RB 1LB  1LB 1LA", 'halt', 3),
+            'slots')
+
+        self.assertTrue(
+            far_verify("1RB 1LB  1LB 1LA", 'halt', 'slots'))
+
+        self.assertFalse(
+            cps_verify("1RB 1LB  1LA ...", 'halt', 'slots'))
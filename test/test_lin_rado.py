@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 from unittest import TestCase
 
 from test.lin_rec import StrictLinRecMachine
-from tm.rust_stuff import term_or_rec
+from tm.rust_stuff import TreeIter, term_or_rec
 from tm.show import show_state
 
 if TYPE_CHECKING:
@@ -97,6 +97,31 @@ class TestLinRado(TestCase):
             LIN_HOLDOUTS,
             BRADY_HOLDOUTS | LR_NOT_BRADY)
 
+    def test_tree(self):
+        batches = list(TreeIter(3, 2, 'halt', sim_lim = 29, batch = 7))
+
+        self.assertTrue(all(len(batch) <= 7 for batch in batches))
+
+        progs = {prog for batch in batches for prog in batch}
+
+        filtered = {
+            prog
+            for batch in TreeIter(3, 2, 'halt', sim_lim = 29, lin = 45)
+            for prog in batch
+        }
+
+        self.assertLess(len(filtered), len(progs))
+        self.assertLessEqual(filtered, progs)
+
+        for _ in TreeIter(2, 3, lin = 100, batch = 1):
+            break
+
+        with self.assertRaises(ValueError):
+            TreeIter(6, 6)
+
+        with self.assertRaises(ValueError):
+            TreeIter(2, 2, 'loop')
+
 
 def read_progs(name: str) -> set[str]:
     with open(f'test/data/lr/{name}.prog') as holdouts:
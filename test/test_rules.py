@@ -2,7 +2,14 @@ from typing import TYPE_CHECKING
 from unittest import TestCase
 
 from tm.rules import Exp as ExpT
-from tm.rules import apply_mult, apply_ops
+from tm.rules import (
+    PlusRule,
+    apply_mult,
+    apply_ops,
+    apply_rule,
+    classify_rule,
+)
+from tm.tape import Block, Tape
 
 if TYPE_CHECKING:
     from tm.rules import OpSeq
@@ -26,6 +33,38 @@ VALUES = {
 
 
 class TestApply(TestCase):
+    def test_apply_rule(self):
+        rule = classify_rule({(0, 0): -2, (1, 0): 3})
+
+        assert isinstance(rule, PlusRule)
+
+        self.assertEqual(rule.indices, ((0, 0), (1, 0)))
+        self.assertEqual(rule.diffs, (-2, 3))
+
+        self.assertNotIsInstance(
+            classify_rule({(0, 0): -2, (1, 0): (2, 0)}),
+            PlusRule)
+
+        tape = Tape([Block(1, 10)], 0, [Block(2, 5), Block(1, 3)])
+
+        self.assertEqual(
+            apply_rule(rule, tape),
+            4)
+
+        self.assertEqual(
+            str(tape),
+            "1^2 [0] 2^17 1^3")
+
+        tape = Tape([Block(1, 10)], 0, [Block(2, Exp(2, 5))])
+
+        self.assertEqual(
+            apply_rule(rule, tape),
+            4)
+
+        self.assertEqual(
+            tape.get_count((1, 0)),
+            Exp(2, 5) + 12)
+
     def test_apply_mult(self):
         for (count, times, mul, add), val in VALUES.items():
             self.assertEqual(
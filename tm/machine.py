@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from tm.macro import MacroInfLoop, make_macro
+from tm.macro import MacroInfLoop, cache_stats, make_macro
 from tm.num import NumError
 from tm.parse import blank_loops
 from tm.prover import ConfigLimit, Prover
@@ -14,6 +14,7 @@ from tm.show import show_comp, show_number, show_slot, show_state
 from tm.tape import Tape
 
 if TYPE_CHECKING:
+    from pathlib import Path
     from typing import Final, Self
 
     from tm.macro import GetInstr, Params, Slot, State
@@ -71,6 +72,9 @@ class Machine:
             lru_history: bool = False,
             opt_macro: int | None = None,
             params: Params | None = None,
+            eager: bool = False,
+            cache_dir: Path | None = None,
+            cache_limit: int | None = None,
     ):
         self.program = make_macro(
             prog,
@@ -80,6 +84,9 @@ class Machine:
             lru_history = lru_history,
             opt_macro = opt_macro,
             params = params,
+            eager = eager,
+            cache_dir = cache_dir,
+            cache_limit = cache_limit,
         )
 
     @property
@@ -130,6 +137,10 @@ class Machine:
             info.append(
                 f'BLANKS: {blanks}')
 
+        if caches := cache_stats(self.program):
+            info.append(
+                f'CACHES: {", ".join(caches)}')
+
         if errors := self.errors:  # no-cover
             info.append(
                 f'ERRORS: {errors}')
@@ -181,12 +192,13 @@ class Machine:
         sim_lim: int = 100_000_000,
         *,
         watch_tape: bool = False,
+        backoff: bool = False,
     ) -> Self:
         comp = self.program
 
         self.tape = tape = Tape()
 
-        self.prover = Prover(comp)
+        self.prover = Prover(comp, backoff = backoff)
 
         self.blanks = {}
 
@@ -1,23 +1,48 @@
+import json
+import os
 from abc import abstractmethod
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from functools import cache
+from hashlib import sha256
+from itertools import product
 from typing import TYPE_CHECKING, Protocol
 
 from tm.parse import tcompile
-from tm.rust_stuff import opt_block
+from tm.rust_stuff import rank_blocks
 from tm.show import show_comp
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from typing import Final
+
     from tm.parse import Color, Instr, Params, Prog, Slot, State
 
     Tape = tuple[Color, ...]
     Config = tuple[State, tuple[bool, Tape]]
 
+    Table = list[list[Instr | None]]
+
+
+EAGER_LIMIT: Final[int] = 2 ** 16
+
+MACRO_CACHE_VERSION: Final[int] = 2
+
 
 class GetInstr(Protocol):
     def __getitem__(self, slot: Slot) -> Instr: ...
 
 ########################################
 
+@cache
+def block_ranks(prog: str, steps: int) -> tuple[tuple[int, int], ...]:
+    return tuple(rank_blocks(prog, steps))
+
+
+def opt_block(prog: str, steps: int) -> int:
+    return block_ranks(prog, steps)[0][0]
+
+
 def make_macro(
         prog: str,
         *,
@@ -27,6 +52,9 @@ def make_macro(
         lru_history: bool = False,
         opt_macro: int | None = None,
         params: Params | None = None,
+        eager: bool = False,
+        cache_dir: Path | None = None,
+        cache_limit: int | None = None,
 ) -> GetInstr:
     comp: GetInstr = tcompile(prog)  # ty: ignore[invalid-assignment]
 
@@ -37,13 +65,36 @@ def make_macro(
         if params is None:
             params = prog_params(comp)
 
-        comp = make_block_macro(comp, blocks, params)
+        comp = make_block_macro(
+            comp,
+            blocks,
+            params,
+            eager = eager,
+            cache_dir = cache_dir,
+            cache_limit = cache_limit,
+        )
 
     if backsym is not None:
         if params is None or blocks is not None:
             params = prog_params(comp)
 
-        comp = make_backsymbol_macro(comp, backsym, params)
+        comp = (
+            make_backsymbol_macro(
+                comp,
+                backsym,
+                params,
+                cache_dir = cache_dir,
+                cache_limit = cache_limit,
+            )
+            if not isinstance(comp, MacroProg) else
+            make_flat_macro(
+                comp,
+                backsym,
+                params,
+                cache_dir = cache_dir,
+                cache_limit = cache_limit,
+            )
+        )
 
     if transcript is not None:
         comp = make_transcript_macro(comp, transcript)  # ty: ignore[invalid-assignment]
@@ -58,16 +109,103 @@ def make_block_macro(
         comp: GetInstr,
         blocks: int,
         params: Params,
+        *,
+        eager: bool = False,
+        cache_dir: Path | None = None,
+        cache_limit: int | None = None,
 ) -> MacroProg:
-    return MacroProg(comp, make_block(blocks, params))
+    logic = make_block(blocks, params, cache_limit)
+
+    if eager and logic.macro_states * logic.macro_colors <= EAGER_LIMIT:
+        return CompiledMacroProg(comp, logic)
+
+    return MacroProg(
+        comp,
+        logic,
+        cache_dir = cache_dir,
+        cache_limit = cache_limit,
+    )
 
 
 def make_backsymbol_macro(
         comp: GetInstr,
         backsym: int,
         params: Params,
+        *,
+        cache_dir: Path | None = None,
+        cache_limit: int | None = None,
+) -> MacroProg:
+    return MacroProg(
+        comp,
+        make_backsym(backsym, params, cache_limit),
+        cache_dir = cache_dir,
+        cache_limit = cache_limit,
+    )
+
+def make_flat_macro(
+        inner: MacroProg,
+        backsym: int,
+        params: Params,
+        *,
+        cache_dir: Path | None = None,
+        cache_limit: int | None = None,
 ) -> MacroProg:
-    return MacroProg(comp, make_backsym(backsym, params))
+    return FlatMacroProg(
+        inner,
+        make_backsym(backsym, params, cache_limit),
+        cache_dir = cache_dir,
+        cache_limit = cache_limit,
+    )
+
+########################################
+
+class LruCache[K, V](OrderedDict[K, V]):
+    limit: int
+
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, limit: int):
+        super().__init__()
+
+        self.limit = limit
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __str__(self) -> str:
+        return f'{self.hits}/{self.misses}/{self.evictions}'
+
+    def __getitem__(self, key: K) -> V:
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            self.misses += 1
+            raise
+
+        self.hits += 1
+
+        self.move_to_end(key)
+
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        super().__setitem__(key, value)
+
+        self.move_to_end(key)
+
+        if len(self) > self.limit:
+            _ = self.popitem(last = False)
+            self.evictions += 1
+
+
+def make_cache[K, V](limit: int | None) -> dict[K, V]:
+    if limit is None:
+        return {}
+
+    return LruCache(limit)
 
 ########################################
 
@@ -77,36 +215,82 @@ CONVERTERS: dict[
 ] = defaultdict(dict)
 
 
-def make_converter(base_colors: int, cells: int) -> TapeColorConverter:
+def make_converter(
+        base_colors: int,
+        cells: int,
+        cache_limit: int | None = None,
+) -> TapeColorConverter:
+    packed = base_colors & (base_colors - 1) == 0
+
+    if cache_limit is not None and not packed:
+        return TapeColorConverter(
+            base_colors, cells, cache_limit = cache_limit)
+
     if (cached := CONVERTERS[base_colors].get(cells)) is not None:
         return cached
 
-    converter = TapeColorConverter(base_colors, cells)
+    converter = (
+        PackedConverter(base_colors, cells)
+        if packed else
+        TapeColorConverter(base_colors, cells)
+    )
+
     CONVERTERS[base_colors][cells] = converter
     return converter
 
 
 class TapeColorConverter:
     base_colors: int
+    cells: int
 
     color_to_tape_cache: dict[Color, tuple[Color, ...]]
     tape_to_color_cache: dict[tuple[Color, ...], Color]
 
-    def __init__(self, base_colors: int, cells: int):
+    def __init__(
+            self,
+            base_colors: int,
+            cells: int,
+            *,
+            cache_limit: int | None = None,
+    ):
         self.base_colors = base_colors
+        self.cells = cells
 
-        self.tape_to_color_cache = {}
-        self.color_to_tape_cache = { 0: (0,) * cells }
+        self.tape_to_color_cache = make_cache(cache_limit)
+        self.color_to_tape_cache = make_cache(cache_limit)
+
+    def register_all(self) -> None:
+        for color, tape in enumerate(
+                product(range(self.base_colors), repeat = self.cells)):
+            self.tape_to_color_cache[tape] = color
+            self.color_to_tape_cache[color] = tape
 
     def color_to_tape(self, color: Color) -> Tape:
-        assert (prev := self.color_to_tape_cache.get(color)) is not None
+        try:
+            return self.color_to_tape_cache[color]
+        except KeyError:
+            pass
+
+        digits: list[Color] = []
+
+        value = color
+
+        for _ in range(self.cells):
+            value, digit = divmod(value, self.base_colors)
+            digits.append(digit)
+
+        tape = tuple(reversed(digits))
+
+        self.tape_to_color_cache[tape] = color
+        self.color_to_tape_cache[color] = tape
 
-        return prev
+        return tape
 
     def tape_to_color(self, tape: Tape) -> Color:
-        if (cached := self.tape_to_color_cache.get(
-                tuple_tape := tuple(tape))) is not None:
-            return cached
+        try:
+            return self.tape_to_color_cache[tuple_tape := tuple(tape)]
+        except KeyError:
+            pass
 
         color: Color = sum(
             value * self.base_colors ** place
@@ -118,12 +302,107 @@ class TapeColorConverter:
 
         return color
 
+
+class PackedConverter(TapeColorConverter):
+    bits: int
+    mask: int
+
+    def __init__(self, base_colors: int, cells: int):
+        super().__init__(base_colors, cells)
+
+        self.bits = base_colors.bit_length() - 1
+        self.mask = base_colors - 1
+
+    def register_all(self) -> None:
+        pass
+
+    def color_to_tape(self, color: Color) -> Tape:
+        bits, mask = self.bits, self.mask
+
+        return tuple(
+            (color >> (bits * place)) & mask
+            for place in reversed(range(self.cells))
+        )
+
+    def tape_to_color(self, tape: Tape) -> Color:
+        bits = self.bits
+
+        color = 0
+
+        for value in tape:
+            color = (color << bits) | value
+
+        return color
+
 ########################################
 
 class MacroInfLoop(Exception):
     pass
 
 
+def macro_cache_key(comp: GetInstr) -> str:
+    if not isinstance(comp, MacroProg):
+        return (
+            show_comp(comp)
+            if isinstance(comp, dict) else
+            str(comp)
+        )
+
+    logic = comp.logic
+
+    return ' | '.join([
+        type(comp).__name__,
+        macro_cache_key(comp.comp),
+        logic.name,
+        str(logic.cells),
+        str(logic.base_states),
+        str(logic.base_colors),
+    ])
+
+
+def macro_cache_path(
+        macro: MacroProg,
+        cache_dir: Path | None,
+) -> Path | None:
+    if cache_dir is None:
+        return None
+
+    key = sha256(
+        f'v{MACRO_CACHE_VERSION} | {macro_cache_key(macro)}'.encode()
+    ).hexdigest()
+
+    return cache_dir / f'{key}.json'
+
+
+def macro_layers(comp: GetInstr) -> Iterator[MacroProg]:
+    while isinstance(comp, MacroProg | HistoryMacro):
+        if isinstance(comp, HistoryMacro):
+            comp = comp.prog
+            continue
+
+        yield comp
+
+        comp = comp.comp
+
+
+def save_macros(comp: GetInstr) -> None:
+    for macro in macro_layers(comp):
+        macro.save_cache()
+
+
+def cache_stats(comp: GetInstr) -> list[str]:
+    return [
+        f'{macro.cells}-cell {macro.logic.name} {name} {cache}'
+        for macro in macro_layers(comp)
+        for name, cache in (
+            ('instrs', macro.instrs),
+            ('tapes', macro.logic.converter.color_to_tape_cache),
+            ('colors', macro.logic.converter.tape_to_color_cache),
+        )
+        if isinstance(cache, LruCache)
+    ]
+
+
 def prog_params(comp: GetInstr) -> Params:
     if isinstance(comp, MacroProg):
         base_states = comp.macro_states
@@ -149,9 +428,22 @@ class MacroProg:
     states: list[State]
     colors: list[Color]
 
-    def __init__(self, comp: GetInstr, logic: Logic):
+    state_index: dict[State, State]
+    color_index: dict[Color, Color]
+
+    cache_path: Path | None
+    cache_loaded: bool
+
+    def __init__(
+            self,
+            comp: GetInstr,
+            logic: Logic,
+            *,
+            cache_dir: Path | None = None,
+            cache_limit: int | None = None,
+    ):
         self.comp = comp
-        self.instrs = {}
+        self.instrs = make_cache(cache_limit)
 
         self.logic = logic
 
@@ -160,6 +452,12 @@ class MacroProg:
         self.states = [0]
         self.colors = [0]
 
+        self.state_index = {0: 0}
+        self.color_index = {0: 0}
+
+        self.cache_path = macro_cache_path(self, cache_dir)
+        self.cache_loaded = False
+
     def __str__(self) -> str:
         comp_str = (
             show_comp(comp)
@@ -187,30 +485,109 @@ class MacroProg:
         except KeyError:
             pass
 
+        if not self.cache_loaded:
+            self.load_cache()
+
+            if (cached := self.instrs.get(slot)) is not None:
+                return cached
+
         in_state, in_color = slot
 
         macro_slot = self.states[in_state], self.colors[in_color]
 
         out_color, shift, out_state = self.calculate_instr(macro_slot)
 
-        try:
-            fwd_color = self.colors.index(out_color)
-        except ValueError:
-            self.colors.append(out_color)
-            fwd_color = len(self.colors) - 1
-
-        try:
-            fwd_state = self.states.index(out_state)
-        except ValueError:
-            self.states.append(out_state)
-            fwd_state = len(self.states) - 1
-
-        instr = fwd_color, shift, fwd_state
+        instr = self.color_id(out_color), shift, self.state_id(out_state)
 
         self.instrs[slot] = instr
 
         return instr
 
+    def color_id(self, color: Color) -> Color:
+        if (index := self.color_index.get(color)) is None:
+            index = self.color_index[color] = len(self.colors)
+            self.colors.append(color)
+
+        return index
+
+    def state_id(self, state: State) -> State:
+        if (index := self.state_index.get(state)) is None:
+            index = self.state_index[state] = len(self.states)
+            self.states.append(state)
+
+        return index
+
+    # Registries only ever grow by appending, so an outer layer's
+    # entries stay valid as long as the inner registry still starts
+    # with the prefix they were computed against. Another run may
+    # have rewritten the inner file in its own discovery order.
+    def registry_digest(self, states: int, colors: int) -> str:
+        return sha256(json.dumps([
+            self.states[:states],
+            self.colors[:colors],
+        ]).encode()).hexdigest()
+
+    def inner_registry(self) -> list[int | str] | None:
+        if not isinstance(inner := self.comp, MacroProg):
+            return None
+
+        states, colors = len(inner.states), len(inner.colors)
+
+        return [states, colors, inner.registry_digest(states, colors)]
+
+    def load_cache(self) -> None:
+        if self.cache_loaded:
+            return
+
+        self.cache_loaded = True
+
+        if isinstance(inner := self.comp, MacroProg):
+            inner.load_cache()
+
+        if (path := self.cache_path) is None or not path.exists():
+            return
+
+        cached = json.loads(path.read_text())
+
+        if (registry := cached['inner']) is not None:
+            states, colors, digest = registry
+
+            if (not isinstance(inner, MacroProg)
+                    or inner.registry_digest(states, colors) != digest):
+                return
+
+        self.states = cached['states']
+        self.colors = cached['colors']
+
+        self.state_index = {
+            state: index for index, state in enumerate(self.states)}
+
+        self.color_index = {
+            color: index for index, color in enumerate(self.colors)}
+
+        for state, color, pr, sh, tr in cached['instrs']:
+            self.instrs[state, color] = pr, sh, tr
+
+    def save_cache(self) -> None:
+        if (path := self.cache_path) is None or not self.cache_loaded:
+            return
+
+        path.parent.mkdir(parents = True, exist_ok = True)
+
+        temp = path.with_suffix(f'.{os.getpid()}.tmp')
+
+        temp.write_text(json.dumps({
+            'states': self.states,
+            'colors': self.colors,
+            'inner': self.inner_registry(),
+            'instrs': [
+                [*slot, *instr]
+                for slot, instr in self.instrs.items()
+            ],
+        }))
+
+        temp.replace(path)
+
     def calculate_instr(self, slot: Slot) -> Instr:
         return self.logic.reconstruct_outputs(
             self.run_simulator(
@@ -222,53 +599,174 @@ class MacroProg:
 
         tape = list(in_tape)
 
-        cells = len(tape)
+        pos = len(tape) - 1 if right_edge else 0
 
-        pos = cells - 1 if right_edge else 0
+        return simulate(self.comp, self.sim_lim, state, tape, pos)
 
-        for _ in range(self.sim_lim):
-            color, shift, next_state = \
-                self.comp[state, scan := tape[pos]]
 
-            if next_state != state:
-                state = next_state
+def simulate(
+        comp: GetInstr,
+        sim_lim: int,
+        state: State,
+        tape: list[Color],
+        pos: int,
+) -> Config:
+    cells = len(tape)
+
+    saved_state, saved_pos, saved_tape = state, pos, tape.copy()
+
+    power, lam = 1, 0
+
+    for _ in range(sim_lim):
+        if (lam
+                and state == saved_state
+                and pos == saved_pos
+                and tape == saved_tape):
+            raise MacroInfLoop
+
+        if lam == power:
+            saved_state, saved_pos, saved_tape = \
+                state, pos, tape.copy()
+
+            power *= 2
+            lam = 0
+
+        lam += 1
+
+        color, shift, next_state = \
+            comp[state, scan := tape[pos]]
 
-                tape[pos] = color
+        if next_state != state:
+            state = next_state
 
-                if shift:
+            tape[pos] = color
+
+            if shift:
+                pos += 1
+                if cells <= pos:
+                    break
+            else:
+                if pos == 0:
+                    break
+                pos -= 1
+
+        else:
+            if shift:
+                while tape[pos] == scan:
+                    tape[pos] = color
                     pos += 1
                     if cells <= pos:
                         break
                 else:
+                    continue
+
+            else:
+                while tape[pos] == scan:
+                    tape[pos] = color
                     if pos == 0:
                         break
                     pos -= 1
+                else:
+                    continue
 
-            else:
-                if shift:
-                    while tape[pos] == scan:
-                        tape[pos] = color
-                        pos += 1
-                        if cells <= pos:
-                            break
-                    else:
-                        continue
+            break
 
-                else:
-                    while tape[pos] == scan:
-                        tape[pos] = color
-                        if pos == 0:
-                            break
-                        pos -= 1
-                    else:
-                        continue
+    else:
+        raise MacroInfLoop  # no-cover
 
-                break
+    return state, (cells <= pos, tuple(tape))
 
-        else:
-            raise MacroInfLoop
 
-        return state, (cells <= pos, tuple(tape))
+class CompiledMacroProg(MacroProg):
+    table: Table
+
+    def __init__(self, comp: GetInstr, logic: Logic):
+        super().__init__(comp, logic)
+
+        logic.converter.register_all()
+
+        self.states = list(range(self.macro_states))
+        self.colors = list(range(self.macro_colors))
+
+        self.state_index = {state: state for state in self.states}
+        self.color_index = {color: color for color in self.colors}
+
+        self.table = [
+            [self.compile_instr((state, color)) for color in self.colors]
+            for state in self.states
+        ]
+
+    def compile_instr(self, slot: Slot) -> Instr | None:
+        try:
+            return self.calculate_instr(slot)
+        except (KeyError, MacroInfLoop):
+            return None
+
+    def __getitem__(self, slot: Slot) -> Instr:
+        if (instr := self.table[slot[0]][slot[1]]) is None:
+            return super().__getitem__(slot)
+
+        return instr
+
+
+class FlatMacroProg(MacroProg):
+    inner: MacroProg
+
+    def __init__(
+            self,
+            inner: MacroProg,
+            logic: Logic,
+            *,
+            cache_dir: Path | None = None,
+            cache_limit: int | None = None,
+    ):
+        super().__init__(
+            inner,
+            logic,
+            cache_dir = cache_dir,
+            cache_limit = cache_limit,
+        )
+
+        self.inner = inner
+
+        self.sim_lim *= inner.sim_lim
+
+    def calculate_instr(self, slot: Slot) -> Instr:
+        inner = self.inner
+
+        cells = inner.cells
+
+        converter = inner.logic.converter
+
+        state, (right_edge, window) = self.logic.deconstruct_inputs(slot)
+
+        base_state, entry_right = divmod(inner.states[state], 2)
+
+        tape = [
+            cell
+            for color in window
+            for cell in converter.color_to_tape(inner.colors[color])
+        ]
+
+        pos = (
+            (len(window) - 1 if right_edge else 0) * cells
+            + (cells - 1 if entry_right else 0)
+        )
+
+        out_state, (exit_right, out_tape) = simulate(
+            inner.comp, self.sim_lim, base_state, tape, pos)
+
+        out_window = tuple(
+            inner.color_id(
+                converter.tape_to_color(out_tape[cell:cell + cells]))
+            for cell in range(0, len(out_tape), cells)
+        )
+
+        macro_state = inner.state_id(
+            (2 * out_state) + int(not exit_right))
+
+        return self.logic.reconstruct_outputs(
+            (macro_state, (exit_right, out_window)))
 
 ########################################
 
@@ -303,12 +801,19 @@ class Logic(Protocol):
 class BlockLogic:
     name = 'block'
 
-    def __init__(self, cells: int, base_states: int, base_colors: int):
+    def __init__(
+            self,
+            cells: int,
+            base_states: int,
+            base_colors: int,
+            *,
+            cache_limit: int | None = None,
+    ):
         self.cells = cells
         self.base_states = base_states
         self.base_colors = base_colors
 
-        self.converter = make_converter(base_colors, cells)
+        self.converter = make_converter(base_colors, cells, cache_limit)
 
     @property
     def macro_states(self) -> int:
@@ -353,13 +858,20 @@ class BacksymbolLogic:
 
     name = 'backsymbol'
 
-    def __init__(self, cells: int, base_states: int, base_colors: int):
+    def __init__(
+            self,
+            cells: int,
+            base_states: int,
+            base_colors: int,
+            *,
+            cache_limit: int | None = None,
+    ):
         self.cells = cells
         self.base_states = base_states
         self.base_colors = base_colors
         self.backsymbols = self.base_colors ** self.cells
 
-        self.converter = make_converter(base_colors, cells)
+        self.converter = make_converter(base_colors, cells, cache_limit)
 
     @property
     def macro_states(self) -> int:
@@ -422,7 +934,14 @@ BACKSYMS: dict[
 ] = defaultdict(dict)
 
 
-def make_block(blocks: int, params: Params) -> BlockLogic:
+def make_block(
+        blocks: int,
+        params: Params,
+        cache_limit: int | None = None,
+) -> BlockLogic:
+    if cache_limit is not None:
+        return BlockLogic(blocks, *params, cache_limit = cache_limit)
+
     if (cached := BLOCKS[params].get(blocks)) is not None:
         return cached
 
@@ -431,7 +950,15 @@ def make_block(blocks: int, params: Params) -> BlockLogic:
     return block
 
 
-def make_backsym(backsyms: int, params: Params) -> BacksymbolLogic:
+def make_backsym(
+        backsyms: int,
+        params: Params,
+        cache_limit: int | None = None,
+) -> BacksymbolLogic:
+    if cache_limit is not None:
+        return BacksymbolLogic(
+            backsyms, *params, cache_limit = cache_limit)
+
     if (cached := BACKSYMS[params].get(backsyms)) is not None:
         return cached
 
@@ -444,7 +971,7 @@ def make_backsym(backsyms: int, params: Params) -> BacksymbolLogic:
 if TYPE_CHECKING:
     from collections.abc import Callable
 
-    History = list[Slot]
+    History = tuple[Slot, ...]
     Updater = Callable[[Slot, History], History]
 
 
@@ -454,13 +981,15 @@ class HistoryMacro:
     instrs: Prog
 
     colors: list[tuple[Color, History]]
+    color_index: dict[tuple[Color, History], Color]
 
     updater: Updater
 
     def __init__(self, prog: GetInstr, updater: Updater):
         self.prog = prog
         self.instrs = {}
-        self.colors = [(0, [])]
+        self.colors = [(0, ())]
+        self.color_index = {(0, ()): 0}
         self.updater = updater
 
     def __getitem__(self, macro_slot: Slot) -> Instr:
@@ -488,13 +1017,12 @@ class HistoryMacro:
         return macro_instr
 
     def encode(self, color: Color, history: History) -> Color:
-        new = (color, history)
+        new = color, history
 
-        for index, entry in enumerate(self.colors):
-            if entry == new:
-                return index
+        if (index := self.color_index.get(new)) is not None:
+            return index
 
-        index = len(self.colors)
+        index = self.color_index[new] = len(self.colors)
 
         self.colors.append(new)
 
@@ -505,23 +1033,12 @@ def update_lru(slot: Slot, past: History) -> History:
     if past and past[0] == slot:
         return past
 
-    history = [entry for entry in past if entry != slot]
-
-    history.insert(0, slot)
-
-    return history
+    return (slot, *(entry for entry in past if entry != slot))
 
 
 def update_transcript(steps: int) -> Callable[[Slot, History], History]:
     def update(slot: Slot, past: History) -> History:
-        history = past.copy()
-
-        if steps <= len(history):
-            history.pop()
-
-        history.insert(0, slot)
-
-        return history
+        return (slot, *past[:steps - 1])
 
     return update
 
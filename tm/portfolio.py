@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing import Pool
+from typing import TYPE_CHECKING
+
+from tm.machine import TERM_CATS, Machine
+from tm.macro import opt_block
+
+if TYPE_CHECKING:
+    from typing import Final
+
+    from tm.machine import Result
+
+    Config = tuple[int | None, int | None]
+
+
+DECISIVE: Final[tuple[str, ...]] = (
+    'infrul',
+    'spnout',
+    'undfnd',
+)
+
+########################################
+
+@dataclass(slots = True)
+class Outcome:
+    blocks: int | None
+    backsym: int | None
+
+    cat: str | None
+    data: Result | None
+
+    machine: str
+
+    @property
+    def decisive(self) -> bool:
+        return self.cat in DECISIVE
+
+    def __str__(self) -> str:
+        return f'blocks={self.blocks} backsym={self.backsym} | {self.machine}'
+
+
+def portfolio_configs(prog: str, opt_macro: int) -> list[Config]:
+    opt = opt_block(prog, opt_macro)
+
+    sizes = dict.fromkeys(
+        blocks if blocks > 1 else None
+        for blocks in (1, opt, opt - 1, opt + 1)
+        if blocks > 0
+    )
+
+    return [
+        (blocks, backsym)
+        for backsym in (None, 1)
+        for blocks in sizes
+    ]
+
+
+def run_config(prog: str, sim_lim: int, config: Config) -> Outcome:
+    blocks, backsym = config
+
+    machine = Machine(
+        prog,
+        blocks = blocks,
+        backsym = backsym,
+    ).run(
+        sim_lim = sim_lim,
+    )
+
+    cat, data = next(
+        (
+            (cat, data)
+            for cat in TERM_CATS
+            if (data := getattr(machine, cat)) is not None
+        ),
+        (None, None),
+    )
+
+    return Outcome(blocks, backsym, cat, data, str(machine))
+
+
+def run_portfolio(
+        prog: str,
+        *,
+        sim_lim: int = 100_000_000,
+        opt_macro: int = 1_000,
+        workers: int | None = None,
+) -> Outcome | None:
+    configs = portfolio_configs(prog, opt_macro)
+
+    with Pool(workers or len(configs)) as pool:
+        for outcome in pool.imap_unordered(
+                partial(run_config, prog, sim_lim),
+                configs):
+            if outcome.decisive:
+                return outcome
+
+    return None
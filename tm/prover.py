@@ -1,17 +1,71 @@
+from dataclasses import dataclass
+from time import perf_counter
 from typing import TYPE_CHECKING
 
 from tm.rules import Plus, apply_rule, make_rule
 from tm.rust_stuff import PastConfigs
 
 if TYPE_CHECKING:
+    from typing import Final
+
     from tm.macro import GetInstr, Slot, State
     from tm.rules import Rule
     from tm.tape import EnumTape, MinSig, Signature, Tape
 
 
+BACKOFF_GRACE: Final[int] = 4
+BACKOFF_CAP: Final[int] = 10
+
+
 class ConfigLimit(Exception):
     pass
 
+########################################
+
+@dataclass(slots = True)
+class SigStats:
+    attempts: int = 0
+    failures: int = 0
+    elapsed: float = 0.0
+
+    streak: int = 0
+    skips: int = 0
+
+    def __str__(self) -> str:
+        return ' | '.join([
+            f'ATTEMPTS: {self.attempts}',
+            f'FAILURES: {self.failures}',
+            f'ELAPSED: {self.elapsed:.6f}',
+        ])
+
+    @property
+    def backoff(self) -> int:
+        if (over := self.streak - BACKOFF_GRACE) < 0:
+            return 0
+
+        return int(2 ** min(over, BACKOFF_CAP)) - 1
+
+    def backing_off(self, *, stable: bool) -> bool:
+        if stable or self.skips >= self.backoff:
+            self.skips = 0
+            return False
+
+        self.skips += 1
+        return True
+
+    def record(self, *, proved: bool, elapsed: float) -> None:
+        self.attempts += 1
+        self.elapsed += elapsed
+
+        if proved:
+            self.streak = 0
+            return
+
+        self.failures += 1
+        self.streak += 1
+
+########################################
+
 
 class Prover:
     prog: GetInstr
@@ -25,11 +79,17 @@ class Prover:
 
     attempts: int
 
-    def __init__(self, prog: GetInstr):
+    stats: dict[Signature, SigStats]
+
+    backoff: bool
+
+    def __init__(self, prog: GetInstr, *, backoff: bool = False):
         self.prog = prog
         self.rules = {}
         self.configs = {}
         self.attempts = 0
+        self.stats = {}
+        self.backoff = backoff
 
     @property
     def has_mult_rules(self) -> bool:
@@ -44,6 +104,16 @@ class Prover:
     def config_count(self) -> int:
         return len(self.configs)
 
+    def show_stats(self) -> str:
+        return '\n'.join(
+            f'{sig} || {stats}'
+            for sig, stats in sorted(
+                self.stats.items(),
+                key = lambda item: item[1].elapsed,
+                reverse = True,
+            )
+        )
+
     def get_rule(
             self,
             state: State,
@@ -134,7 +204,26 @@ class Prover:
         if (deltas := past_configs.next_deltas(state, cycle)) is None:
             return None
 
-        if (rule := self.prove_rule(deltas, state, tape, sig)) is None:
+        if (stats := self.stats.get(sig)) is None:
+            stats = self.stats[sig] = SigStats()
+
+        if self.backoff and stats.backing_off(
+                stable = deltas[0] == deltas[1] == deltas[2]):
+            self.attempts += 1
+            return None
+
+        rule: Rule | None = None
+
+        start = perf_counter()
+
+        try:
+            rule = self.prove_rule(deltas, state, tape, sig)
+        finally:
+            stats.record(
+                proved = rule is not None,
+                elapsed = perf_counter() - start)
+
+        if rule is None:
             return None
 
         self.attempts = 0
@@ -287,7 +287,27 @@ def make_rule(*countses: Counts) -> Rule | None:
     if unhandled_op:
         raise unhandled_op
 
-    return rule
+    return classify_rule(rule)
+
+
+class PlusRule(dict['Index', 'Op']):  # ruff:ignore[subclass-builtin]
+    indices: tuple[Index, ...]
+    diffs: tuple[Plus, ...]
+
+    def __init__(self, rule: Rule, diffs: list[Plus]):
+        super().__init__(rule)
+
+        self.indices = tuple(rule)
+        self.diffs = tuple(diffs)
+
+
+def classify_rule(rule: Rule) -> Rule:
+    diffs = [diff for diff in rule.values() if isinstance(diff, Plus)]
+
+    if len(diffs) < len(rule):
+        return rule
+
+    return PlusRule(rule, diffs)
 
 
 class IndexTape(Protocol):
@@ -330,11 +350,17 @@ def apply_rule(rule: Rule, tape: IndexTape) -> Count | None:
 
     times, min_pos, min_res = apps
 
-    results: dict[Index, Count] = {}
+    counts = [tape.get_count(pos) for pos in rule]
 
-    for pos, diff in rule.items():
-        count = tape.get_count(pos)
+    if (isinstance(rule, PlusRule)
+            and isinstance(times, int)
+            and all(isinstance(count, int) for count in counts)):
+        apply_plus(rule, tape, counts, times, min_pos, min_res)
+        return times
 
+    results: dict[Index, Count] = {}
+
+    for (pos, diff), count in zip(rule.items(), counts, strict = True):
         match diff:
             case (int() as mul, int() as add):
                 result = apply_mult(count, times, mul, add)
@@ -355,6 +381,21 @@ def apply_rule(rule: Rule, tape: IndexTape) -> Count | None:
     return times
 
 
+def apply_plus(
+        rule: PlusRule,
+        tape: IndexTape,
+        counts: list[Count],
+        times: int,
+        min_pos: Index,
+        min_res: Count,
+) -> None:
+    for pos, diff, count in zip(
+            rule.indices, rule.diffs, counts, strict = True):
+        tape.set_count(
+            pos,
+            min_res if pos == min_pos else count + diff * times)
+
+
 def apply_mult(count: Count, times: Count, mul: int, add: int) -> Count:
     if not isinstance(count, int) and count.depth > 20:
         raise CountDepth
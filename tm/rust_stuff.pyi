@@ -24,9 +24,9 @@ type Instr = tuple[Color, Shift, State]
 
 type Params = tuple[State, Color]
 
-type Prog = dict[Slot, Instr]
+type Instrs = dict[Slot, Instr]
 
-def tcompile(program: str) -> Prog: ...
+def tcompile(program: str) -> Instrs: ...
 
 def halt_slots(prog: str) -> list[Slot]: ...
 
@@ -42,7 +42,83 @@ def show_instr(instr: Instr | None) -> str: ...
 
 def read_instr(instr: str) -> Instr | None: ...
 
-def show_comp(comp: Prog) -> str: ...
+def show_comp(comp: Instrs) -> str: ...
+
+class Prog:
+    def __init__(self, prog: str) -> None: ...
+
+    def __hash__(self) -> int: ...
+    def __eq__(self, other: object) -> bool: ...
+
+    def tcompile(self) -> Instrs: ...
+
+    def halt_slots(self) -> set[Slot]: ...
+    def erase_slots(self) -> set[Slot]: ...
+    def zr_shifts(self) -> set[tuple[State, Shift]]: ...
+
+    def opt_block(self, steps: int) -> int: ...
+    def rank_blocks(self, steps: int) -> list[tuple[int, int]]: ...
+
+    def run_quick_machine(self, sim_lim: int) -> MachineResult: ...
+
+    def term_or_rec(self, sim_lim: int) -> bool: ...
+    def run_transcript(self, sim_lim: int) -> bool: ...
+    def check_inf(self, sim_lim: int) -> bool: ...
+
+    def bkw_cant_halt(self, steps: int) -> BackwardResult: ...
+    def bkw_cant_blank(self, steps: int) -> BackwardResult: ...
+    def bkw_cant_zloop(self, steps: int) -> BackwardResult: ...
+    def bkw_cant_spinout(self, steps: int) -> BackwardResult: ...
+    def bkw_cant_twostep(self, steps: int) -> BackwardResult: ...
+
+    def cps_cant_halt(self, rad: int) -> bool: ...
+    def cps_cant_blank(self, rad: int) -> bool: ...
+    def cps_cant_spinout(self, rad: int) -> bool: ...
+    def cps_cant_quasihalt(self, rad: int) -> bool: ...
+
+    def far_cant_halt(self, steps: int) -> bool: ...
+    def far_cant_blank(self, steps: int) -> bool: ...
+    def far_cant_spinout(self, steps: int) -> bool: ...
+
+## pipeline ############################
+
+class Verdict:
+    @property
+    def stage(self) -> str | None: ...
+    @property
+    def timings(self) -> list[tuple[str, float]]: ...
+    def is_settled(self) -> bool: ...
+
+class Pipeline:
+    def __init__(
+            self,
+            goal: str,
+            stages: list[tuple[str, int]] | None = None,
+    ) -> None: ...
+
+    def stages(self) -> list[str]: ...
+
+    def __call__(self, prog: str) -> Verdict: ...
+
+    def run(self, prog: Prog) -> Verdict: ...
+
+## tree ################################
+
+class TreeIter:
+    def __init__(
+            self,
+            states: int,
+            colors: int,
+            goal: str | None = None,
+            sim_lim: int = 100,
+            lin: int | None = None,
+            pipeline: Pipeline | None = None,
+            batch: int = 1_000,
+    ) -> None: ...
+
+    def __iter__(self) -> TreeIter: ...
+
+    def __next__(self) -> list[str]: ...
 
 ## machine #############################
 
@@ -105,6 +181,8 @@ type Rule = dict[Index, Op]
 
 def opt_block(prog: str, steps: int) -> int: ...
 
+def rank_blocks(prog: str, steps: int) -> list[tuple[int, int]]: ...
+
 ## reason ##############################
 
 class BackwardResult:
@@ -134,3 +212,92 @@ def cps_cant_quasihalt(prog: str, rad: int) -> bool: ...
 def far_cant_halt(prog: str, block_len: int) -> bool: ...
 def far_cant_blank(prog: str, block_len: int) -> bool: ...
 def far_cant_spinout(prog: str, block_len: int) -> bool: ...
+
+## batch ###############################
+
+def term_or_rec_batch(progs: list[str], sim_lim: int) -> list[bool]: ...
+def run_transcript_batch(progs: list[str], sim_lim: int) -> list[bool]: ...
+def check_inf_batch(progs: list[str], sim_lim: int) -> list[bool]: ...
+
+def bkw_cant_halt_batch(progs: list[str], steps: int) -> list[BackwardResult]: ...
+def bkw_cant_blank_batch(progs: list[str], steps: int) -> list[BackwardResult]: ...
+def bkw_cant_zloop_batch(progs: list[str], steps: int) -> list[BackwardResult]: ...
+def bkw_cant_spinout_batch(progs: list[str], steps: int) -> list[BackwardResult]: ...
+def bkw_cant_twostep_batch(progs: list[str], steps: int) -> list[BackwardResult]: ...
+
+def cps_cant_halt_batch(progs: list[str], rad: int) -> list[bool]: ...
+def cps_cant_blank_batch(progs: list[str], rad: int) -> list[bool]: ...
+def cps_cant_spinout_batch(progs: list[str], rad: int) -> list[bool]: ...
+def cps_cant_quasihalt_batch(progs: list[str], rad: int) -> list[bool]: ...
+
+def far_cant_halt_batch(progs: list[str], steps: int) -> list[bool]: ...
+def far_cant_blank_batch(progs: list[str], steps: int) -> list[bool]: ...
+def far_cant_spinout_batch(progs: list[str], steps: int) -> list[bool]: ...
+
+## budget ##############################
+
+class CancelToken:
+    def __init__(self) -> None: ...
+    def cancel(self) -> None: ...
+    def is_cancelled(self) -> bool: ...
+
+class Budget:
+    def __init__(
+            self,
+            work: int | None = None,
+            timeout: float | None = None,
+            cancel: CancelToken | None = None,
+    ) -> None: ...
+
+class Outcome(Enum):
+    proved = ...
+    unproved = ...
+    exhausted = ...
+
+class Report:
+    @property
+    def outcome(self) -> Outcome: ...
+    @property
+    def work(self) -> int: ...
+    def is_settled(self) -> bool: ...
+    def is_exhausted(self) -> bool: ...
+
+def bkw_cant_halt_budget(prog: str, steps: int, budget: Budget) -> Report: ...
+def bkw_cant_blank_budget(prog: str, steps: int, budget: Budget) -> Report: ...
+def bkw_cant_zloop_budget(prog: str, steps: int, budget: Budget) -> Report: ...
+def bkw_cant_spinout_budget(prog: str, steps: int, budget: Budget) -> Report: ...
+def bkw_cant_twostep_budget(prog: str, steps: int, budget: Budget) -> Report: ...
+
+def cps_cant_halt_budget(prog: str, rad: int, budget: Budget) -> Report: ...
+def cps_cant_blank_budget(prog: str, rad: int, budget: Budget) -> Report: ...
+def cps_cant_spinout_budget(prog: str, rad: int, budget: Budget) -> Report: ...
+def cps_cant_quasihalt_budget(prog: str, rad: int, budget: Budget) -> Report: ...
+
+def far_cant_halt_budget(prog: str, steps: int, budget: Budget) -> Report: ...
+def far_cant_blank_budget(prog: str, steps: int, budget: Budget) -> Report: ...
+def far_cant_spinout_budget(prog: str, steps: int, budget: Budget) -> Report: ...
+
+def bkw_cant_halt_budget_batch(progs: list[str], steps: int, budget: Budget) -> list[Report]: ...
+def bkw_cant_blank_budget_batch(progs: list[str], steps: int, budget: Budget) -> list[Report]: ...
+def bkw_cant_zloop_budget_batch(progs: list[str], steps: int, budget: Budget) -> list[Report]: ...
+def bkw_cant_spinout_budget_batch(progs: list[str], steps: int, budget: Budget) -> list[Report]: ...
+def bkw_cant_twostep_budget_batch(progs: list[str], steps: int, budget: Budget) -> list[Report]: ...
+
+def cps_cant_halt_budget_batch(progs: list[str], rad: int, budget: Budget) -> list[Report]: ...
+def cps_cant_blank_budget_batch(progs: list[str], rad: int, budget: Budget) -> list[Report]: ...
+def cps_cant_spinout_budget_batch(progs: list[str], rad: int, budget: Budget) -> list[Report]: ...
+def cps_cant_quasihalt_budget_batch(progs: list[str], rad: int, budget: Budget) -> list[Report]: ...
+
+def far_cant_halt_budget_batch(progs: list[str], steps: int, budget: Budget) -> list[Report]: ...
+def far_cant_blank_budget_batch(progs: list[str], steps: int, budget: Budget) -> list[Report]: ...
+def far_cant_spinout_budget_batch(progs: list[str], steps: int, budget: Budget) -> list[Report]: ...
+
+## certificates ########################
+
+def cps_certify(prog: str, goal: str, rad: int) -> str | None: ...
+def cps_verify(prog: str, goal: str, cert: str) -> bool: ...
+def cps_verify_batch(certs: list[tuple[str, str]], goal: str) -> list[bool]: ...
+
+def far_certify(prog: str, goal: str, block: int) -> str | None: ...
+def far_verify(prog: str, goal: str, cert: str) -> bool: ...
+def far_verify_batch(certs: list[tuple[str, str]], goal: str) -> list[bool]: ...
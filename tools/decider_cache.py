@@ -0,0 +1,198 @@
+import json
+import sqlite3
+from contextlib import suppress
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from tm.rust_stuff import (
+    bkw_cant_blank_batch,
+    bkw_cant_halt_batch,
+    bkw_cant_spinout_batch,
+    cps_cant_blank_batch,
+    cps_cant_halt_batch,
+    cps_cant_spinout_batch,
+    far_cant_blank_batch,
+    far_cant_halt_batch,
+    far_cant_spinout_batch,
+)
+from tools.normalize import Normalizer, expand
+from tools.tree_norm import tree_swap
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from typing import Final, Self
+
+    from tm.rust_stuff import BackwardResult
+
+    type Decider = Callable[[list[str], int], list[bool]]
+
+########################################
+
+def bkw(
+        batch: Callable[[list[str], int], list[BackwardResult]],
+) -> Decider:
+    return lambda progs, steps: [
+        res.is_refuted()
+        for res in batch(progs, steps)
+    ]
+
+
+DECIDERS: dict[tuple[str, str], Decider] = {
+    ('bkw', 'halt'): bkw(bkw_cant_halt_batch),
+    ('bkw', 'blank'): bkw(bkw_cant_blank_batch),
+    ('bkw', 'spinout'): bkw(bkw_cant_spinout_batch),
+    ('cps', 'halt'): cps_cant_halt_batch,
+    ('cps', 'blank'): cps_cant_blank_batch,
+    ('cps', 'spinout'): cps_cant_spinout_batch,
+    ('far', 'halt'): far_cant_halt_batch,
+    ('far', 'blank'): far_cant_blank_batch,
+    ('far', 'spinout'): far_cant_spinout_batch,
+}
+
+SCHEMA: Final[str] = """
+    create table if not exists results (
+        prog text not null,
+        decider text not null,
+        goal text not null,
+        proved integer,
+        unproved integer,
+        primary key (prog, decider, goal)
+    ) without rowid
+"""
+
+LOOKUP: Final[str] = """
+    select prog, proved, unproved from results
+    where decider = ? and goal = ?
+        and prog in (select value from json_each(?))
+"""
+
+UPSERT: Final[str] = """
+    insert into results values (?, ?, ?, ?, ?)
+    on conflict (prog, decider, goal) do update set
+        proved = min(coalesce(proved, excluded.proved),
+                     coalesce(excluded.proved, proved)),
+        unproved = max(coalesce(unproved, excluded.unproved),
+                       coalesce(excluded.unproved, unproved))
+"""
+
+########################################
+
+# States and colors are renumbered in order of first use on the
+# blank tape and the first move is made rightward, so renamings,
+# color permutations and mirror images all share one entry. Each
+# step is a relabeling, so verdicts carry over to the original.
+@lru_cache(maxsize = 1 << 16)
+def canonical(prog: str) -> str:
+    norm = Normalizer(expand(prog))
+
+    for _ in range(1_000):  # no-branch
+        try:
+            if not tree_swap(norm):
+                break
+        except KeyError:
+            break
+
+    # A KeyError here comes from looking up the first instruction,
+    # before any direction is flipped, and every swap made above is a
+    # whole relabeling. The result is still equivalent to the input,
+    # just maybe not the representative, which only costs cache hits.
+    with suppress(KeyError):
+        norm.normalize_directions()
+
+    return str(norm)
+
+
+# The deciders escalate through every smaller radius, step count or
+# block length, so each (program, decider, goal) keeps just the least
+# parameter that proved it and the greatest that did not. Queries
+# between the two are run again.
+class DeciderCache:
+    db: sqlite3.Connection
+
+    def __init__(self, path: str = ':memory:'):
+        self.db = sqlite3.connect(path)
+
+        self.db.execute('pragma journal_mode = wal')
+        self.db.execute(SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def lookup(
+            self,
+            decider: str,
+            goal: str,
+            progs: list[str],
+            param: int,
+    ) -> Iterator[tuple[str, bool]]:
+        rows = self.db.execute(
+            LOOKUP,
+            (decider, goal, json.dumps(progs)))
+
+        for prog, proved, unproved in rows:
+            if proved is not None and proved <= param:
+                yield prog, True
+            elif unproved is not None and param <= unproved:
+                yield prog, False
+
+    def store(
+            self,
+            decider: str,
+            goal: str,
+            results: dict[str, bool],
+            param: int,
+    ) -> None:
+        self.db.executemany(
+            UPSERT,
+            (
+                (
+                    prog,
+                    decider,
+                    goal,
+                    param if proved else None,
+                    None if proved else param,
+                )
+                for prog, proved in results.items()
+            ))
+
+        self.db.commit()
+
+    def decide_batch(
+            self,
+            decider: str,
+            goal: str,
+            progs: list[str],
+            param: int,
+    ) -> list[bool]:
+        canons = [canonical(prog) for prog in progs]
+
+        known = dict(
+            self.lookup(decider, goal, list(set(canons)), param))
+
+        if todo := sorted(set(canons) - known.keys()):
+            fresh = dict(zip(
+                todo,
+                DECIDERS[decider, goal](todo, param),
+                strict = True))
+
+            self.store(decider, goal, fresh, param)
+
+            known |= fresh
+
+        return [known[canon] for canon in canons]
+
+    def decide(
+            self,
+            decider: str,
+            goal: str,
+            prog: str,
+            param: int,
+    ) -> bool:
+        return self.decide_batch(decider, goal, [prog], param)[0]